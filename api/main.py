@@ -1,5 +1,19 @@
 import os
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+from flask import (
+    Flask,
+    render_template,
+    request,
+    redirect,
+    url_for,
+    flash,
+    jsonify,
+    send_from_directory,
+    abort,
+    g,
+    has_request_context,
+    before_render_template,
+    template_rendered,
+)
 from flask_login import (
     LoginManager,
     UserMixin,
@@ -10,39 +24,1129 @@ from flask_login import (
 )
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
-from datetime import datetime
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header, parse_cookie
+from datetime import datetime, timedelta
 import pytz
 from dateutil import parser
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import create_client, acreate_client, Client, ClientOptions, AsyncClientOptions
+from postgrest.exceptions import APIError
 import time
-import traceback
+import asyncio
+import cProfile
+import functools
+import io
+import marshal
+import pstats
+import gzip
+import json
+import glob
+import click
+import hashlib
+import sqlite3
+import logging
+import logging.handlers
+import queue
+import random
+import re
+import threading
+import urllib.parse
+import urllib.request
+import zlib
+import atexit
+import httpx
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from waitress import serve
 
+try:
+    import brotli
+except ImportError: # brotli is optional; responses fall back to gzip without it
+    brotli = None
+
+try:
+    from a2wsgi import WSGIMiddleware
+except ImportError: # only needed for SERVER_MODE=asgi
+    WSGIMiddleware = None
+
 # Load environment variables from .env file
 load_dotenv()
 
 app = Flask(__name__)
 app.config["SECRET_KEY"] = os.getenv("SECRET_KEY")
 
+# "supabase" (default) or "sqlite" to run entirely against the local database, e.g. offline
+DATA_BACKEND = os.getenv("DATA_BACKEND", "supabase")
+
 # Initialize Supabase client
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-if not SUPABASE_URL or not SUPABASE_KEY:
+# Hard per-call deadline for PostgREST requests (the client default is 120 seconds)
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "5"))
+if SUPABASE_URL and SUPABASE_KEY:
+    supabase: Client = create_client(
+        SUPABASE_URL,
+        SUPABASE_KEY,
+        options=ClientOptions(postgrest_client_timeout=SUPABASE_TIMEOUT),
+    )
+elif DATA_BACKEND == "sqlite":
+    supabase = None # Storage uploads are unavailable offline
+else:
     raise Exception(
         "SUPABASE_URL and SUPABASE_KEY must be set in your environment variables"
     )
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 # Flask-Login setup
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = "admin_login"
 
+# Structured Logging
+#
+# With STRUCTURED_LOGGING=1 the app logger only enqueues records; a background
+# QueueListener formats them as JSON lines and writes them out, so a slow log
+# sink never adds latency to a request. Records are formatted lazily in the
+# writer thread, INFO/DEBUG records logged with extra={"sample": True} are
+# sampled at LOG_SAMPLE_RATE, and payloads wrapped in LogPayload are truncated
+# to LOG_PAYLOAD_MAX_CHARS.
+STRUCTURED_LOGGING = os.getenv("STRUCTURED_LOGGING", "0") == "1"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.1"))
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "1000"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Attributes every LogRecord has; anything else came from `extra`
+LOG_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "sample"}
+
+
+class LogPayload:
+    """Defers str() of a (possibly large) value until the record is formatted, then truncates it."""
+
+    def __init__(self, value, limit=None):
+        self.value = value
+        self.limit = limit or LOG_PAYLOAD_MAX_CHARS
+
+    def __str__(self):
+        text = self.value if isinstance(self.value, str) else repr(self.value)
+        if len(text) > self.limit:
+            return f"{text[:self.limit]}... [{len(text) - self.limit} more chars]"
+        return text
+
+    __repr__ = __str__
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if getattr(record, "sample", False) and record.levelno < logging.WARNING:
+            return random.random() < self.rate
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Enqueues records untouched and drops them if the writer has fallen behind."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # The listener runs in-process, so the record need not be pickle-safe;
+        # skipping the base class's format() keeps formatting off the request thread.
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    # Only values wrapped in LogPayload are truncated; messages and tracebacks are
+    # written whole so the final exception line is never lost.
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, pytz.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in LOG_RECORD_ATTRIBUTES:
+                entry[key] = value if isinstance(value, (int, float, bool, type(None))) else str(value)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_structured_logging():
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(LOG_SAMPLE_RATE))
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(JsonFormatter())
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    app.logger.handlers[:] = [queue_handler]
+    app.logger.setLevel(LOG_LEVEL)
+    app.logger.propagate = False
+    return queue_handler
+
+
+log_queue_handler = configure_structured_logging() if STRUCTURED_LOGGING else None
+
+# Supabase Resilience
+#
+# Public and admin JSON reads go through resilient_read(), which keeps the last
+# good result per key. Fresh results (younger than READ_CACHE_TTL) are served
+# directly; stale ones are served immediately while a background worker
+# refreshes them. A circuit breaker stops calling Supabase after repeated
+# failures, serving stale data until a half-open probe succeeds, so a degraded
+# backend cannot pin every request thread on the HTTP timeout.
+READ_CACHE_TTL = float(os.getenv("READ_CACHE_TTL", "15"))
+READ_CACHE_MAX_STALE = float(os.getenv("READ_CACHE_MAX_STALE", "86400"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+
+
+class SupabaseUnavailable(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold, reset_seconds):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self._lock = threading.Lock()
+        self.counters = {"calls": 0, "failures": 0, "short_circuited": 0, "opened": 0}
+
+    def allow(self):
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = "half_open"
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self.probe_in_flight:
+                # Let exactly one probe through; everyone else keeps short-circuiting
+                self.probe_in_flight = True
+                return True
+            self.counters["short_circuited"] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.counters["calls"] += 1
+            self.state = "closed"
+            self.failures = 0
+            self.probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.counters["calls"] += 1
+            self.counters["failures"] += 1
+            self.failures += 1
+            self.probe_in_flight = False
+            if self.state != "open" and (self.state == "half_open" or self.failures >= self.failure_threshold):
+                # Calls that started before the breaker opened must not push back the probe
+                self.counters["opened"] += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def call(self, fetch):
+        if not self.allow():
+            raise SupabaseUnavailable("Supabase circuit is open")
+        try:
+            result = fetch()
+        except APIError:
+            # PostgREST answered; the request itself was bad, the backend is fine
+            self.record_success()
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    async def acall(self, fetch):
+        """call() for a coroutine function; shares state with synchronous callers."""
+        if not self.allow():
+            raise SupabaseUnavailable("Supabase circuit is open")
+        try:
+            result = await fetch()
+        except APIError:
+            self.record_success()
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def metrics(self):
+        with self._lock:
+            return dict(self.counters, state=self.state, consecutive_failures=self.failures)
+
+
+supabase_breaker = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS)
+# key -> (data, fetched_at)
+read_cache = {}
+read_cache_lock = threading.Lock()
+read_refreshes_in_flight = set()
+# Kept separate from the waitress pool so refreshes never take a request thread
+read_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="supabase-refresh")
+read_cache_stats = {"fresh_hits": 0, "stale_hits": 0, "misses": 0, "refresh_failures": 0}
+
+
+# Single-flight: concurrent identical reads share one round trip. The first
+# caller for a key runs the query; callers arriving while it is in flight wait
+# for its result (or error) instead of issuing their own. SupabaseBackend keys
+# every select and count by query_key() of the query it actually runs, and
+# resilient_read() additionally coalesces whole reads (and their circuit
+# breaker accounting) under the read's cache key.
+SINGLE_FLIGHT_TIMEOUT = float(os.getenv("SINGLE_FLIGHT_TIMEOUT", str(SUPABASE_TIMEOUT + 1)))
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+single_flights = {}
+single_flights_lock = threading.Lock()
+single_flight_stats = {"leaders": 0, "coalesced": 0, "timeouts": 0}
+
+
+def query_key(table, filters=(), order=(), limit=None, offset=0, count=False):
+    """Normalize a backend read into a hashable key; filter order does not matter."""
+    filters = [(op, column, tuple(value) if isinstance(value, list) else value) for op, column, value in filters]
+    return (table, tuple(sorted(filters, key=repr)), tuple(order), limit, offset, count)
+
+
+def single_flight(key, fetch, timeout=None):
+    with single_flights_lock:
+        flight = single_flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = single_flights[key] = _Flight()
+            single_flight_stats["leaders"] += 1
+        else:
+            single_flight_stats["coalesced"] += 1
+
+    if not leader:
+        if not flight.done.wait(SINGLE_FLIGHT_TIMEOUT if timeout is None else timeout):
+            with single_flights_lock:
+                single_flight_stats["timeouts"] += 1
+            raise SupabaseUnavailable(f"Timed out waiting for in-flight read {key}")
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    try:
+        flight.result = fetch()
+        return flight.result
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with single_flights_lock:
+            del single_flights[key]
+        flight.done.set()
+
+
+def _refresh_read(key, fetch):
+    try:
+        data = single_flight(key, lambda: supabase_breaker.call(fetch))
+        with read_cache_lock:
+            read_cache[key] = (data, time.monotonic())
+    except Exception as e:
+        with read_cache_lock:
+            read_cache_stats["refresh_failures"] += 1
+        app.logger.warning("Background refresh of %s failed: %s - %s", key, type(e).__name__, e)
+    finally:
+        with read_cache_lock:
+            read_refreshes_in_flight.discard(key)
+
+
+def _lookup_read(key, ttl):
+    """
+    Return (cached, refresh) for key: cached is the (data, fetched_at) entry or
+    None on a miss, and refresh is True when the caller should start the single
+    background refresh for a stale entry.
+    """
+    ttl = READ_CACHE_TTL if ttl is None else ttl
+    now = time.monotonic()
+    with read_cache_lock:
+        cached = read_cache.get(key)
+        if cached and now - cached[1] > READ_CACHE_MAX_STALE:
+            cached = None
+        if cached and now - cached[1] <= ttl:
+            read_cache_stats["fresh_hits"] += 1
+            return cached, False
+        if cached:
+            read_cache_stats["stale_hits"] += 1
+            refresh = key not in read_refreshes_in_flight
+            if refresh:
+                read_refreshes_in_flight.add(key)
+            return cached, refresh
+        read_cache_stats["misses"] += 1
+        return None, False
+
+
+def resilient_read(key, fetch, ttl=None):
+    """
+    Return fetch() through the read cache and circuit breaker. Raises
+    SupabaseUnavailable (or the fetch error) only when there is no usable
+    cached value to fall back on.
+    """
+    cached, refresh = _lookup_read(key, ttl)
+    if cached:
+        if refresh:
+            read_refresh_executor.submit(_refresh_read, key, fetch)
+        return cached[0]
+
+    data = single_flight(key, lambda: supabase_breaker.call(fetch))
+    with read_cache_lock:
+        read_cache[key] = (data, time.monotonic())
+    return data
+
+
+def invalidate_reads(*keys):
+    """Drop cached reads after a write so the next request fetches fresh data."""
+    with read_cache_lock:
+        for key in keys:
+            read_cache.pop(key, None)
+
+
+def resilience_metrics():
+    with read_cache_lock:
+        cache = dict(read_cache_stats, entries=len(read_cache), refreshing=len(read_refreshes_in_flight))
+    with single_flights_lock:
+        flights = dict(single_flight_stats, in_flight=len(single_flights))
+    return {"circuit": supabase_breaker.metrics(), "read_cache": cache, "single_flight": flights}
+
+# Request Profiling
+#
+# Opt-in per-request profiling for diagnosing slow pages in production. A
+# request is profiled when an admin sends the PROFILE_HEADER header, or, with
+# PROFILING=1, for a PROFILE_SAMPLE_RATE fraction of all requests. A profiled
+# request runs under cProfile and records spans for backend calls, template
+# renders and the datetimeformat filter. It answers with an X-Profile-Id header
+# and a Server-Timing header (shown in the browser's network panel). The last
+# PROFILE_KEEP profiles stay in memory:
+#
+#   GET /api/profiles                  summaries, newest first
+#   GET /api/profiles/<id>             text report: spans and top functions
+#   GET /api/profiles/<id>/download    raw cProfile stats (pstats, snakeviz)
+#
+# Profiles are per process, so on multi-instance deployments fetch them from
+# the instance that served the request. Requests served natively by asgi_app
+# are not profiled; send the header to the WSGI server to profile those pages.
+PROFILING_ENABLED = os.getenv("PROFILING", "0") == "1"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0.01"))
+PROFILE_HEADER = os.getenv("PROFILE_HEADER", "X-Profile")
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "20"))
+PROFILE_MAX_SPANS = 500
+PROFILE_TOP_FUNCTIONS = 40
+
+
+class RequestProfile:
+    def __init__(self, method, path, reason):
+        self.id = os.urandom(6).hex()
+        self.method = method
+        self.path = path
+        self.reason = reason
+        self.started_at = datetime.now(pytz.utc)
+        self.status = None
+        self.duration = None
+        # (name, offset from request start, duration), in seconds
+        self.spans = []
+        # name -> [count, total seconds]
+        self.totals = {}
+        self.template_starts = []
+        # Set while a db: span is open, so nested backend calls are not counted twice
+        self.in_db_span = False
+        self.start = time.perf_counter()
+        self.profiler = cProfile.Profile()
+        try:
+            self.profiler.enable()
+        except ValueError: # Python 3.12+ allows one active profiler; keep the spans only
+            self.profiler = None
+
+    def add_span(self, name, start):
+        end = time.perf_counter()
+        total = self.totals.setdefault(name, [0, 0.0])
+        total[0] += 1
+        total[1] += end - start
+        if len(self.spans) < PROFILE_MAX_SPANS:
+            self.spans.append((name, start - self.start, end - start))
+
+    def finish(self):
+        if self.profiler is not None:
+            self.profiler.disable()
+        self.duration = time.perf_counter() - self.start
+
+    def category_totals(self):
+        # "db:SupabaseBackend.select(users)" -> "db"
+        categories = {}
+        for name, (count, seconds) in self.totals.items():
+            category = name.split(":", 1)[0]
+            categories[category] = categories.get(category, 0.0) + seconds
+        return categories
+
+    def server_timing(self):
+        elapsed = time.perf_counter() - self.start
+        metrics = [f"{category};dur={seconds * 1000:.1f}" for category, seconds in self.category_totals().items()]
+        metrics.append(f"app;dur={elapsed * 1000:.1f}")
+        return ", ".join(metrics)
+
+    def summary(self):
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "reason": self.reason,
+            "status": self.status,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration * 1000, 1) if self.duration is not None else None,
+            "span_ms": {category: round(seconds * 1000, 1) for category, seconds in self.category_totals().items()},
+            "has_stats": self.profiler is not None,
+        }
+
+    def report(self):
+        lines = [
+            f"{self.method} {self.path} -> {self.status} in {self.duration * 1000:.1f} ms ({self.reason}, {self.started_at.isoformat()})",
+            "",
+            "Span totals (calls, total ms):",
+        ]
+        for name, (count, seconds) in sorted(self.totals.items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {seconds * 1000:9.1f}  {count:5d}  {name}")
+        lines += ["", "Timeline (offset ms, duration ms):"]
+        lines += [f"  {offset * 1000:9.1f}  {seconds * 1000:9.1f}  {name}" for name, offset, seconds in self.spans if not name.startswith("filter:")]
+        if self.profiler is not None:
+            out = io.StringIO()
+            pstats.Stats(self.profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+            lines += ["", out.getvalue()]
+        return "\n".join(lines)
+
+    def dump(self):
+        # Same format as Profile.dump_stats(), readable by pstats.Stats(path).
+        # create_stats() re-snapshots, since pstats.Stats(profiler) empties .stats
+        self.profiler.create_stats()
+        return marshal.dumps(self.profiler.stats)
+
+
+recent_profiles = OrderedDict()
+recent_profiles_lock = threading.Lock()
+profile_stats = {"captured": 0, "sampled": 0, "requested": 0}
+
+
+def _current_profile():
+    return g.get("profile") if has_request_context() else None
+
+
+@contextmanager
+def profile_span(name):
+    profile = _current_profile()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_span(name, start)
+
+
+def traced(method):
+    """Record a span for a backend call while the current request is profiled."""
+    @functools.wraps(method)
+    def wrapper(self, table, *args, **kwargs):
+        profile = _current_profile()
+        # Only the outermost call is recorded, e.g. SQLiteBackend.update() and not its select()/upsert()
+        if profile is None or profile.in_db_span:
+            return method(self, table, *args, **kwargs)
+        profile.in_db_span = True
+        try:
+            with profile_span(f"db:{type(self).__name__}.{method.__name__}({table})"):
+                return method(self, table, *args, **kwargs)
+        finally:
+            profile.in_db_span = False
+    return wrapper
+
+
+@app.before_request
+def start_profile():
+    reason = None
+    # Only the header check touches current_user, so unprofiled requests skip the user lookup
+    if request.headers.get(PROFILE_HEADER) and current_user.is_authenticated:
+        reason = "requested"
+    elif PROFILING_ENABLED and random.random() < PROFILE_SAMPLE_RATE:
+        reason = "sampled"
+    if reason:
+        g.profile = RequestProfile(request.method, request.full_path.rstrip("?"), reason)
+
+
+@app.after_request
+def add_profile_headers(response):
+    # Registered before the other after_request hooks, so it runs after them
+    profile = _current_profile()
+    if profile is not None:
+        profile.status = response.status_code
+        response.headers["X-Profile-Id"] = profile.id
+        response.headers["Server-Timing"] = profile.server_timing()
+    return response
+
+
+@app.teardown_request
+def store_profile(exc):
+    profile = g.pop("profile", None)
+    if profile is None:
+        return
+    profile.finish()
+    if profile.status is None:
+        profile.status = 500
+    with recent_profiles_lock:
+        recent_profiles[profile.id] = profile
+        while len(recent_profiles) > PROFILE_KEEP:
+            recent_profiles.popitem(last=False)
+        profile_stats["captured"] += 1
+        profile_stats[profile.reason] += 1
+    app.logger.info("Profiled %s %s in %.1f ms (profile %s)", profile.method, profile.path, profile.duration * 1000, profile.id)
+
+
+@before_render_template.connect_via(app)
+def _template_render_started(sender, template, context, **extra):
+    profile = _current_profile()
+    if profile is not None:
+        profile.template_starts.append(time.perf_counter())
+
+
+@template_rendered.connect_via(app)
+def _template_render_finished(sender, template, context, **extra):
+    profile = _current_profile()
+    if profile is not None and profile.template_starts:
+        profile.add_span(f"template:{template.name}", profile.template_starts.pop())
+
+
+def _get_profile(profile_id):
+    with recent_profiles_lock:
+        profile = recent_profiles.get(profile_id)
+    if profile is None:
+        abort(404)
+    return profile
+
+
+@app.route("/api/profiles", methods=["GET"])
+@login_required
+def list_profiles():
+    with recent_profiles_lock:
+        profiles = list(recent_profiles.values())
+    return jsonify([profile.summary() for profile in reversed(profiles)])
+
+
+@app.route("/api/profiles/<profile_id>", methods=["GET"])
+@login_required
+def get_profile_report(profile_id):
+    return _get_profile(profile_id).report(), 200, {"Content-Type": "text/plain; charset=utf-8"}
+
+
+@app.route("/api/profiles/<profile_id>/download", methods=["GET"])
+@login_required
+def download_profile(profile_id):
+    profile = _get_profile(profile_id)
+    if profile.profiler is None:
+        abort(404)
+    return profile.dump(), 200, {
+        "Content-Type": "application/octet-stream",
+        "Content-Disposition": f"attachment; filename=profile-{profile.id}.prof",
+    }
+
+
+def profiling_metrics():
+    with recent_profiles_lock:
+        return dict(profile_stats, stored=len(recent_profiles), enabled=PROFILING_ENABLED, sample_rate=PROFILE_SAMPLE_RATE)
+
+# Data Access
+#
+# Routes talk to the repositories below instead of building supabase.table()
+# chains. Each repository reads and writes through a backend:
+#   SupabaseBackend - the hosted project; always used for writes and admin reads.
+#   SQLiteBackend   - a local database. With READ_REPLICA=1 it is a replica of
+#                     REPLICA_TABLES, kept current by incremental pulls, and serves
+#                     public reads at in-process latency. With DATA_BACKEND=sqlite it
+#                     is the only backend, so the app runs offline for tests and
+#                     benchmarks (seed it with `flask sync-replica`).
+#
+# Incremental pulls key on `updated_at`. Tables without that column are pulled in
+# full on every sync, which is fine for the small post tables. To enable it:
+#
+#   ALTER TABLE bulletin_posts ADD COLUMN updated_at TIMESTAMPTZ DEFAULT NOW() NOT NULL;
+#   CREATE TRIGGER bulletin_posts_updated_at BEFORE UPDATE ON bulletin_posts
+#       FOR EACH ROW EXECUTE FUNCTION moddatetime(updated_at);
+#
+# Filters are (op, column, value) tuples using the PostgREST method names, and
+# order is a list of (column, descending) pairs.
+READ_REPLICA_ENABLED = os.getenv("READ_REPLICA", "0") == "1"
+REPLICA_PATH = os.getenv("REPLICA_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "replica.sqlite3"))
+REPLICA_TABLES = [table for table in os.getenv("REPLICA_TABLES", "bulletin_posts,news_posts").split(",") if table]
+REPLICA_SYNC_INTERVAL = float(os.getenv("REPLICA_SYNC_INTERVAL", "30"))
+REPLICA_PULL_BATCH_SIZE = 500
+REPLICA_CURSOR_COLUMN = "updated_at"
+DATA_TABLES = {"bulletin_posts", "news_posts", "notifications", "notifications_archive", "patch_notes", "system_maintenance", "users"}
+SQLITE_OPERATORS = {"eq": "=", "neq": "!=", "lt": "<", "lte": "<=", "gt": ">", "gte": ">="}
+
+
+class SupabaseBackend:
+    def __init__(self, client):
+        self.client = client
+
+    def _filtered(self, query, filters):
+        for op, column, value in filters:
+            query = getattr(query, op)(column, value)
+        return query
+
+    def _select_query(self, table, filters=(), order=(), limit=None, offset=0):
+        query = self._filtered(self.client.table(table).select("*"), filters)
+        for column, desc in order:
+            query = query.order(column, desc=desc)
+        if limit is not None:
+            query = query.range(offset, offset + limit - 1)
+        return query
+
+    def _count_query(self, table, filters=()):
+        return self._filtered(self.client.table(table).select("id", count="exact"), filters).limit(1)
+
+    @traced
+    def select(self, table, filters=(), order=(), limit=None, offset=0):
+        return single_flight(
+            query_key(table, filters, order, limit, offset),
+            lambda: self._select_query(table, filters, order, limit, offset).execute().data or [],
+        )
+
+    @traced
+    def count(self, table, filters=()):
+        return single_flight(
+            query_key(table, filters, count=True),
+            lambda: self._count_query(table, filters).execute().count or 0,
+        )
+
+    @traced
+    def ids(self, table):
+        # Paged by id: PostgREST caps every response at its max-rows setting
+        ids = []
+        while True:
+            query = self.client.table(table).select("id").order("id")
+            if ids:
+                query = query.gt("id", ids[-1])
+            rows = query.range(0, REPLICA_PULL_BATCH_SIZE - 1).execute().data or []
+            ids.extend(row["id"] for row in rows)
+            if len(rows) < REPLICA_PULL_BATCH_SIZE:
+                return ids
+
+    @traced
+    def insert(self, table, data):
+        return self.client.table(table).insert(data).execute().data or []
+
+    @traced
+    def update(self, table, filters, data):
+        return self._filtered(self.client.table(table).update(data), filters).execute().data or []
+
+    @traced
+    def delete(self, table, filters):
+        return self._filtered(self.client.table(table).delete(), filters).execute().data or []
+
+    @traced
+    def upsert(self, table, rows):
+        return self.client.table(table).upsert(rows).execute().data or []
+
+
+class SQLiteBackend:
+    """Stores each row as a JSON document keyed by id; filters use json_extract()."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._connection() as conn:
+            for table in DATA_TABLES:
+                conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" (id INTEGER PRIMARY KEY, row TEXT NOT NULL)')
+            conn.execute("CREATE TABLE IF NOT EXISTS _sync_state (tbl TEXT PRIMARY KEY, cursor TEXT, last_id INTEGER, synced_at REAL)")
+            if "last_id" not in [column[1] for column in conn.execute("PRAGMA table_info(_sync_state)")]:
+                conn.execute("ALTER TABLE _sync_state ADD COLUMN last_id INTEGER")
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # One connection per thread; WAL lets the sync writer run alongside readers
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _where(self, table, filters):
+        if table not in DATA_TABLES:
+            raise ValueError(f"Unknown table: {table}")
+        clauses = []
+        params = []
+        for op, column, value in filters:
+            path = f"json_extract(row, '$.{column}')" if column != "id" else "id"
+            if op == "in_":
+                clauses.append(f"{path} IN ({', '.join('?' * len(value))})")
+                params.extend(value)
+            else:
+                clauses.append(f"{path} {SQLITE_OPERATORS[op]} ?")
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    @traced
+    def select(self, table, filters=(), order=(), limit=None, offset=0):
+        where, params = self._where(table, filters)
+        sql = f'SELECT row FROM "{table}"{where}'
+        if order:
+            sql += " ORDER BY " + ", ".join(f"json_extract(row, '$.{column}') {'DESC' if desc else 'ASC'}" for column, desc in order)
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        return [json.loads(row) for (row,) in self._connection().execute(sql, params)]
+
+    @traced
+    def count(self, table, filters=()):
+        where, params = self._where(table, filters)
+        return self._connection().execute(f'SELECT COUNT(*) FROM "{table}"{where}', params).fetchone()[0]
+
+    @traced
+    def ids(self, table):
+        self._where(table, ()) # validates the table name
+        return [id for (id,) in self._connection().execute(f'SELECT id FROM "{table}" ORDER BY id')]
+
+    @traced
+    def insert(self, table, data):
+        rows = data if isinstance(data, list) else [data]
+        with self._write_lock, self._connection() as conn:
+            next_id = conn.execute(f'SELECT COALESCE(MAX(id), 0) + 1 FROM "{table}"').fetchone()[0]
+            inserted = []
+            now = datetime.now(pytz.utc).isoformat()
+            for row in rows:
+                # Mirror the Postgres column defaults the app relies on
+                row = {"created_at": now, **row}
+                if row.get("id") is None:
+                    row["id"] = next_id
+                    next_id += 1
+                conn.execute(f'INSERT INTO "{table}" (id, row) VALUES (?, ?)', (row["id"], json.dumps(row, default=str)))
+                inserted.append(row)
+        return inserted
+
+    @traced
+    def update(self, table, filters, data):
+        rows = [dict(row, **data) for row in self.select(table, filters)]
+        self.upsert(table, rows)
+        return rows
+
+    @traced
+    def delete(self, table, filters):
+        rows = self.select(table, filters)
+        where, params = self._where(table, filters)
+        with self._write_lock, self._connection() as conn:
+            conn.execute(f'DELETE FROM "{table}"{where}', params)
+        return rows
+
+    @traced
+    def upsert(self, table, rows):
+        with self._write_lock, self._connection() as conn:
+            conn.executemany(
+                f'INSERT OR REPLACE INTO "{table}" (id, row) VALUES (?, ?)',
+                [(row["id"], json.dumps(row, default=str)) for row in rows],
+            )
+
+    def retain_ids(self, table, ids):
+        """Delete local rows whose id is no longer present upstream."""
+        with self._write_lock, self._connection() as conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS _keep (id INTEGER PRIMARY KEY)")
+            conn.execute("DELETE FROM _keep")
+            conn.executemany("INSERT OR IGNORE INTO _keep (id) VALUES (?)", [(i,) for i in ids])
+            removed = conn.execute(f'DELETE FROM "{table}" WHERE id NOT IN (SELECT id FROM _keep)').rowcount
+        return removed
+
+    def sync_state(self, table):
+        """(cursor, last_id, synced_at) of the last pull, or None if never synced."""
+        return self._connection().execute("SELECT cursor, last_id, synced_at FROM _sync_state WHERE tbl = ?", (table,)).fetchone()
+
+    def set_sync_state(self, table, cursor, last_id=None):
+        with self._write_lock, self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO _sync_state (tbl, cursor, last_id, synced_at) VALUES (?, ?, ?, ?)",
+                (table, cursor, last_id, time.time()),
+            )
+
+
+class ReplicaSync:
+    """Pulls REPLICA_TABLES from Supabase into the SQLite replica."""
+
+    def __init__(self, source, replica, tables, interval):
+        self.source = source
+        self.replica = replica
+        self.tables = tables
+        self.interval = interval
+        self.last_sync = 0.0
+        self.ready = all(replica.sync_state(table) for table in tables)
+        self._running = threading.Lock()
+        self.stats = {"syncs": 0, "rows_pulled": 0, "rows_removed": 0, "failures": 0}
+
+    def _next_page(self, table, cursor, last_id):
+        """
+        The next batch after (cursor, last_id) in (updated_at, id) order. Filters
+        have no OR, so the keyset condition
+        `updated_at > cursor OR (updated_at = cursor AND id > last_id)`
+        is read as the rest of the tied rows followed by the newer ones.
+        """
+        order = [(REPLICA_CURSOR_COLUMN, False), ("id", False)]
+        if cursor is None:
+            return self.source.select(table, order=order, limit=REPLICA_PULL_BATCH_SIZE)
+        rows = self.source.select(table, [("eq", REPLICA_CURSOR_COLUMN, cursor), ("gt", "id", last_id or 0)], [("id", False)], REPLICA_PULL_BATCH_SIZE)
+        if len(rows) < REPLICA_PULL_BATCH_SIZE:
+            rows += self.source.select(table, [("gt", REPLICA_CURSOR_COLUMN, cursor)], order, REPLICA_PULL_BATCH_SIZE - len(rows))
+        return rows
+
+    def pull_table(self, table):
+        state = self.replica.sync_state(table)
+        cursor, last_id = (state[0], state[1]) if state else (None, None)
+        pulled = 0
+        try:
+            while True:
+                rows = self._next_page(table, cursor, last_id)
+                self.replica.upsert(table, rows)
+                pulled += len(rows)
+                if rows:
+                    cursor, last_id = rows[-1][REPLICA_CURSOR_COLUMN], rows[-1]["id"]
+                if len(rows) < REPLICA_PULL_BATCH_SIZE:
+                    break
+        except APIError:
+            # No updated_at column on this table: fall back to a full pull, paged by id
+            pulled = 0
+            last_id = 0
+            while True:
+                rows = self.source.select(table, [("gt", "id", last_id)], [("id", False)], REPLICA_PULL_BATCH_SIZE)
+                self.replica.upsert(table, rows)
+                pulled += len(rows)
+                if rows:
+                    last_id = rows[-1]["id"]
+                if len(rows) < REPLICA_PULL_BATCH_SIZE:
+                    break
+            cursor = last_id = None
+        # Incremental pulls cannot see deletes, so reconcile ids on every sync
+        removed = self.replica.retain_ids(table, self.source.ids(table))
+        self.replica.set_sync_state(table, cursor, last_id)
+        return pulled, removed
+
+    def sync(self):
+        if not self._running.acquire(blocking=False):
+            return False
+        try:
+            for table in self.tables:
+                pulled, removed = self.pull_table(table)
+                self.stats["rows_pulled"] += pulled
+                self.stats["rows_removed"] += removed
+            self.stats["syncs"] += 1
+            self.last_sync = time.monotonic()
+            self.ready = True
+            return True
+        except Exception as e:
+            self.stats["failures"] += 1
+            app.logger.warning("Replica sync failed: %s - %s", type(e).__name__, e)
+            return False
+        finally:
+            self._running.release()
+
+    def maybe_sync(self):
+        """Schedule a background pull if the replica is older than the sync interval."""
+        if time.monotonic() - self.last_sync >= self.interval and not self._running.locked():
+            read_refresh_executor.submit(self.sync)
+
+    def metrics(self):
+        return dict(self.stats, ready=self.ready, tables=self.tables, seconds_since_sync=round(time.monotonic() - self.last_sync, 1) if self.last_sync else None)
+
+
+class Repository:
+    table = None
+
+    def __init__(self, primary, replica=None, replica_sync=None):
+        self.primary = primary
+        self.replica = replica
+        self.replica_sync = replica_sync
+
+    def _public_backend(self):
+        """Backend for public pages: the local replica once it has been populated."""
+        if self.replica is None:
+            return self.primary
+        self.replica_sync.maybe_sync()
+        return self.replica if self.replica_sync.ready else self.primary
+
+    def _written(self, rows, deleted=False):
+        # Write-through so this process sees its own writes before the next pull
+        if self.replica is not None and rows:
+            if deleted:
+                self.replica.delete(self.table, [("in_", "id", [row["id"] for row in rows])])
+            else:
+                self.replica.upsert(self.table, rows)
+        return rows
+
+    def record_written(self, rows, deleted=False):
+        """Write-through for rows written to the primary by another client, e.g. the async one."""
+        return self._written(rows, deleted)
+
+    def get(self, id):
+        rows = self.primary.select(self.table, [("eq", "id", id)], limit=1)
+        return rows[0] if rows else None
+
+    def create(self, data):
+        return self._written(self.primary.insert(self.table, data))
+
+    def update(self, id, data):
+        return self._written(self.primary.update(self.table, [("eq", "id", id)], data))
+
+    def delete(self, id):
+        return self._written(self.primary.delete(self.table, [("eq", "id", id)]), deleted=True)
+
+
+class PostRepository(Repository):
+    def __init__(self, table, *args, **kwargs):
+        self.table = table
+        super().__init__(*args, **kwargs)
+
+    def active(self, limit=8):
+        return self._public_backend().select(self.table, [("eq", "is_active", True)], [("date_posted", True)], limit)
+
+    def all(self):
+        return self.primary.select(self.table, order=[("date_posted", True)])
+
+    def count(self):
+        return self.primary.count(self.table)
+
+
+class NotificationRepository(Repository):
+    table = "notifications"
+
+    def unread(self):
+        return self.primary.select(self.table, [("eq", "is_read", False)], [("created_at", True)])
+
+    def unread_count(self):
+        return self.primary.count(self.table, [("eq", "is_read", False)])
+
+    def mark_read(self, id):
+        return self.update(id, {"is_read": True})
+
+    def read_before(self, cutoff, limit):
+        return self.primary.select(self.table, [("eq", "is_read", True), ("lt", "created_at", cutoff)], [("id", False)], limit)
+
+    def delete_many(self, ids):
+        return self._written(self.primary.delete(self.table, [("in_", "id", ids)]), deleted=True)
+
+
+class NotificationArchiveRepository(Repository):
+    table = "notifications_archive"
+
+    def archive(self, rows):
+        # upsert so a batch archived by an interrupted run is not rejected as a duplicate
+        return self.primary.upsert(self.table, rows)
+
+    def page(self, form_type, offset, limit):
+        """Return (items, total), newest first."""
+        filters = [("eq", "form_type", form_type)] if form_type else []
+        items = self.primary.select(self.table, filters, [("created_at", True)], limit, offset)
+        return items, self.primary.count(self.table, filters)
+
+
+class PatchNoteRepository(Repository):
+    table = "patch_notes"
+
+    def all(self):
+        return self.primary.select(self.table, order=[("date", True)])
+
+    def latest(self):
+        rows = self.primary.select(self.table, order=[("date", True)], limit=1)
+        return rows[0] if rows else None
+
+
+class MaintenanceRepository(Repository):
+    table = "system_maintenance"
+
+    def all(self):
+        return self.primary.select(self.table, order=[("start_time", True)])
+
+    def active_or_upcoming(self, now):
+        # The most recent window that is currently active, else the soonest upcoming one
+        rows = self.primary.select(self.table, [("lte", "start_time", now), ("gte", "end_time", now)], [("start_time", True)], 1)
+        if not rows:
+            rows = self.primary.select(self.table, [("gt", "start_time", now)], [("start_time", False)], 1)
+        return rows[0] if rows else None
+
+
+class UserRepository(Repository):
+    table = "users"
+
+    def by_username(self, username):
+        rows = self.primary.select(self.table, [("eq", "username", username)], limit=1)
+        return rows[0] if rows else None
+
+    def exists(self):
+        return bool(self.primary.select(self.table, limit=1))
+
+
+if DATA_BACKEND == "sqlite":
+    primary_backend = SQLiteBackend(REPLICA_PATH)
+    replica_backend = replica_sync = None
+else:
+    primary_backend = SupabaseBackend(supabase)
+    replica_backend = SQLiteBackend(REPLICA_PATH) if READ_REPLICA_ENABLED else None
+    replica_sync = ReplicaSync(primary_backend, replica_backend, REPLICA_TABLES, REPLICA_SYNC_INTERVAL) if replica_backend else None
+
+
+def _replicated(table):
+    return (replica_backend, replica_sync) if replica_backend is not None and table in REPLICA_TABLES else (None, None)
+
+
+bulletins_repo = PostRepository("bulletin_posts", primary_backend, *_replicated("bulletin_posts"))
+news_repo = PostRepository("news_posts", primary_backend, *_replicated("news_posts"))
+notifications_repo = NotificationRepository(primary_backend, *_replicated("notifications"))
+notifications_archive_repo = NotificationArchiveRepository(primary_backend)
+patch_notes_repo = PatchNoteRepository(primary_backend, *_replicated("patch_notes"))
+maintenance_repo = MaintenanceRepository(primary_backend, *_replicated("system_maintenance"))
+users_repo = UserRepository(primary_backend, *_replicated("users"))
+
+
+@app.cli.command("sync-replica")
+@click.option("--all-tables", is_flag=True, help="Pull every table, e.g. to seed a DATA_BACKEND=sqlite install.")
+def sync_replica_command(all_tables):
+    """Pull Supabase tables into the local SQLite database."""
+    if supabase is None:
+        raise click.ClickException("SUPABASE_URL and SUPABASE_KEY are required to sync the replica.")
+    tables = sorted(DATA_TABLES) if all_tables else REPLICA_TABLES
+    sync = ReplicaSync(SupabaseBackend(supabase), SQLiteBackend(REPLICA_PATH), tables, 0)
+    for table in tables:
+        pulled, removed = sync.pull_table(table)
+        click.echo(f"{table}: pulled {pulled} rows, removed {removed}")
+
+MANILA_TZ = pytz.timezone("Asia/Manila")
+
+
 # In app.py, modify get_manila_time() function
 def get_manila_time():
-    manila_tz = pytz.timezone("Asia/Manila")
-    return datetime.now(manila_tz)
+    return datetime.now(MANILA_TZ)
 
 # Helper function to upload image to Supabase Storage
 def upload_to_supabase_storage(file, bucket_name):
@@ -75,41 +1179,41 @@ def upload_to_supabase_storage(file, bucket_name):
 
 # Helper function to delete image from Supabase Storage
 def delete_from_supabase_storage(image_url, bucket_name):
-    app.logger.info(f"delete_from_supabase_storage called with image_url: '{image_url}', bucket_name: '{bucket_name}'")
+    app.logger.info("delete_from_supabase_storage called with image_url: '%s', bucket_name: '%s'", image_url, bucket_name)
     if not image_url:
         app.logger.info("delete_from_supabase_storage: No image_url provided. Exiting.")
         return False # No URL, so nothing to delete, but not an error in deletion itself. Consider if True is better. For now, False.
 
     filename = ""
     try:
-        app.logger.debug(f"Attempting to extract filename. Splitting URL '{image_url}' by '/{bucket_name}/'")
+        app.logger.debug("Attempting to extract filename. Splitting URL '%s' by '/%s/'", image_url, bucket_name)
         parts = image_url.split(f"/{bucket_name}/")
 
         if len(parts) < 2 or not parts[1]:
-            app.logger.warning(f"Could not extract valid filename. URL: '{image_url}', Bucket: '{bucket_name}'. Parts: {parts}. Exiting.")
+            app.logger.warning("Could not extract valid filename. URL: '%s', Bucket: '%s'. Parts: %s. Exiting.", image_url, bucket_name, parts)
             return False
 
         filename = parts[1]
         if '?' in filename: # Remove query parameters if they exist
             filename = filename.split('?')[0]
-        app.logger.info(f"Extracted filename for deletion: '{filename}'")
+        app.logger.info("Extracted filename for deletion: '%s'", filename)
 
         # Attempt to remove the file
-        app.logger.info(f"Attempting Supabase storage.from_('{bucket_name}').remove(['{filename}'])")
+        app.logger.info("Attempting Supabase storage.from_('%s').remove(['%s'])", bucket_name, filename)
         response_list = supabase.storage.from_(bucket_name).remove([filename])
-        app.logger.info(f"Supabase raw response for deleting '{filename}': {response_list}")
+        app.logger.info("Supabase raw response for deleting '%s': %s", filename, LogPayload(response_list), extra={"sample": True})
 
         if response_list is None:
-            app.logger.error(f"Supabase returned None response for deletion of '{filename}'. This is unexpected. Assuming failure.")
+            app.logger.error("Supabase returned None response for deletion of '%s'. This is unexpected. Assuming failure.", filename)
             return False
 
         # Default to True. If response_list is empty (e.g., file not found, or simple success), it's a success.
         # If there are items in response_list, we check them for errors.
         deletion_successful = True
         for item_idx, item in enumerate(response_list):
-            app.logger.debug(f"Processing response item {item_idx} for '{filename}': {item}")
+            app.logger.debug("Processing response item %d for '%s': %s", item_idx, filename, LogPayload(item), extra={"sample": True})
             if not isinstance(item, dict):
-                app.logger.error(f"Response item {item_idx} for '{filename}' is not a dict: {item}. Marking as failure.")
+                app.logger.error("Response item %d for '%s' is not a dict: %s. Marking as failure.", item_idx, filename, LogPayload(item))
                 deletion_successful = False
                 break # An invalid response item means we can't be sure, so flag as error
 
@@ -117,7 +1221,10 @@ def delete_from_supabase_storage(image_url, bucket_name):
             # It could be None or an object.
             item_error = item.get("error")
             if item_error is not None: # If 'error' key exists and is not None, it's an error
-                app.logger.error(f"Deletion failure reported by Supabase for '{filename}' (item {item_idx}). Error: '{item_error}'. Message: '{item.get('message', 'N/A')}'. Full item: {item}")
+                app.logger.error(
+                    "Deletion failure reported by Supabase for '%s' (item %d). Error: '%s'. Message: '%s'. Full item: %s",
+                    filename, item_idx, item_error, item.get('message', 'N/A'), LogPayload(item),
+                )
                 deletion_successful = False
                 break # Single file deletion, one error means failure
             else:
@@ -126,15 +1233,21 @@ def delete_from_supabase_storage(image_url, bucket_name):
                 # item_message = item.get("message")
                 # item_status_code = item.get("status_code", item.get("status"))
                 # For now, the absence of an 'error' object is sufficient for success per item.
-                app.logger.info(f"No error reported in response item {item_idx} for '{filename}'. Assuming success for this item. Item: {item}")
+                app.logger.info(
+                    "No error reported in response item %d for '%s'. Assuming success for this item. Item: %s",
+                    item_idx, filename, LogPayload(item), extra={"sample": True},
+                )
 
-        app.logger.info(f"Exiting delete_from_supabase_storage for '{filename}'. Overall success: {deletion_successful}")
+        app.logger.info("Exiting delete_from_supabase_storage for '%s'. Overall success: %s", filename, deletion_successful)
         return deletion_successful
 
     except Exception as e:
-        # Log detailed error including filename if available
+        # Log detailed error including filename if available; the traceback is formatted by the log writer
         log_filename = filename if filename else f"unknown (URL: {image_url})"
-        app.logger.error(f"Exception in delete_from_supabase_storage for '{log_filename}' from bucket '{bucket_name}'. Type: {type(e).__name__}. Error: {str(e)}. Traceback: {traceback.format_exc()}")
+        app.logger.error(
+            "Exception in delete_from_supabase_storage for '%s' from bucket '%s'. Type: %s. Error: %s.",
+            log_filename, bucket_name, type(e).__name__, e, exc_info=True,
+        )
         return False
 
 class User(UserMixin):
@@ -152,9 +1265,8 @@ class User(UserMixin):
 @login_manager.user_loader
 def load_user(user_id):
     try:
-        resp = supabase.table("users").select("*").eq("id", int(user_id)).single().execute()
-        if resp.data:
-            user = resp.data
+        user = users_repo.get(int(user_id))
+        if user:
             return User(
                 id=user["id"],
                 username=user["username"],
@@ -167,35 +1279,164 @@ def load_user(user_id):
     return None
 
 
-@app.route("/")
-def index():
-    bulletins_resp = (
-        supabase.table("bulletin_posts")
-        .select("*, image_url")
-        .eq("is_active", True)
-        .order("date_posted", desc=True)
-        .limit(8)
-        .execute()
-    )
-    news_resp = (
-        supabase.table("news_posts")
-        .select("*, image_url")
-        .eq("is_active", True)
-        .order("date_posted", desc=True)
-        .limit(8)
-        .execute()
-    )
-    bulletins = bulletins_resp.data or []
-    news = news_resp.data or []
+# Read-cache keys name the repository read they cache; the queries themselves are
+# coalesced by the backend
+HOME_BULLETINS_READ = "bulletins_repo.active"
+HOME_NEWS_READ = "news_repo.active"
+
+
+def render_home_page():
+    try:
+        bulletins = resilient_read(HOME_BULLETINS_READ, bulletins_repo.active)
+        news = resilient_read(HOME_NEWS_READ, news_repo.active)
+    except Exception as e:
+        # No cached copy to fall back on: still serve the page, just without posts
+        app.logger.error("Home page data unavailable: %s - %s", type(e).__name__, e)
+        return render_template("home.html", bulletins=[], news=[]), 503
     manila_time = get_manila_time().strftime("%B %d, %Y %I:%M %p")
     return render_template("home.html", bulletins=bulletins, news=news)
 
 
+@app.route("/")
+def index():
+    if STATIC_EXPORT_ENABLED and not static_home_stale and os.path.exists(os.path.join(STATIC_EXPORT_DIR, "index.html")):
+        return send_from_directory(STATIC_EXPORT_DIR, "index.html")
+    return render_home_page()
+
+
 @app.route("/admin")
 def admin_redirect():
     return redirect(url_for("admin_login"))
 
 
+# Login Throttling
+#
+# The client IP and the submitted username each get a token bucket. Attempts are
+# checked before any Supabase lookup or password hash, so a credential-stuffing
+# burst is rejected cheaply instead of tying up waitress threads. Repeated
+# failures lock out the (IP, username) pair for exponentially longer periods;
+# the username alone is only rate limited, so nobody else can lock an admin out.
+# Rejected attempts never create entries, and a key that is still locked out is
+# never evicted to make room for new ones.
+LOGIN_RATE_PER_MINUTE = float(os.getenv("LOGIN_RATE_PER_MINUTE", "5"))
+LOGIN_BURST = int(os.getenv("LOGIN_BURST", "5"))
+LOGIN_LOCKOUT_AFTER_FAILURES = int(os.getenv("LOGIN_LOCKOUT_AFTER_FAILURES", "5"))
+LOGIN_LOCKOUT_BASE_SECONDS = int(os.getenv("LOGIN_LOCKOUT_BASE_SECONDS", "30"))
+LOGIN_LOCKOUT_MAX_SECONDS = int(os.getenv("LOGIN_LOCKOUT_MAX_SECONDS", "3600"))
+LOGIN_THROTTLE_MAX_KEYS = int(os.getenv("LOGIN_THROTTLE_MAX_KEYS", "10000"))
+# Only trust X-Forwarded-For behind a known proxy; Vercel sets VERCEL=1
+TRUST_PROXY_HEADERS = os.getenv("TRUST_PROXY_HEADERS", "1" if os.getenv("VERCEL") else "0") == "1"
+
+
+class LoginThrottle:
+    def __init__(self, rate_per_minute, burst, lockout_after, lockout_base, lockout_max, max_keys):
+        self.refill_per_second = rate_per_minute / 60
+        self.burst = burst
+        self.lockout_after = lockout_after
+        self.lockout_base = lockout_base
+        self.lockout_max = lockout_max
+        self.max_keys = max_keys
+        # key -> {"tokens", "updated", "failures", "lockouts", "locked_until"}, least recently used first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"allowed": 0, "rejected": 0, "failures": 0, "lockouts": 0, "evictions": 0}
+
+    def _refill(self, entry, now):
+        entry["tokens"] = min(self.burst, entry["tokens"] + (now - entry["updated"]) * self.refill_per_second)
+        entry["updated"] = now
+
+    def _entry(self, key, now):
+        """The entry for key, refilled and marked most recently used; created if missing."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self._refill(entry, now)
+            return entry
+        entry = self._entries[key] = {"tokens": float(self.burst), "updated": now, "failures": 0, "lockouts": 0, "locked_until": 0.0}
+        self._evict(now)
+        return entry
+
+    def _evict(self, now):
+        # Least recently used first, skipping keys that are still locked out
+        skipped = 0
+        while len(self._entries) > self.max_keys and skipped < len(self._entries):
+            key, entry = next(iter(self._entries.items()))
+            if entry["locked_until"] > now:
+                self._entries.move_to_end(key)
+                skipped += 1
+            else:
+                del self._entries[key]
+                self.counters["evictions"] += 1
+
+    def acquire(self, rate_keys, lockout_key):
+        """
+        Take one token for every rate key and check the lockout key. Returns 0
+        if allowed, else seconds until retry.
+        """
+        now = time.monotonic()
+        with self._lock:
+            retry_after = 0.0
+            # Look up only; a rejected attempt must not create (and evict) entries
+            for key in [*rate_keys, lockout_key]:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                self._refill(entry, now)
+                if entry["locked_until"] > now:
+                    retry_after = max(retry_after, entry["locked_until"] - now)
+                elif key != lockout_key and entry["tokens"] < 1:
+                    retry_after = max(retry_after, (1 - entry["tokens"]) / self.refill_per_second)
+            if retry_after:
+                self.counters["rejected"] += 1
+                return int(retry_after) + 1
+            for key in rate_keys:
+                self._entry(key, now)["tokens"] -= 1
+            self._entry(lockout_key, now)
+            self.counters["allowed"] += 1
+            return 0
+
+    def record_failure(self, lockout_key):
+        now = time.monotonic()
+        with self._lock:
+            self.counters["failures"] += 1
+            entry = self._entry(lockout_key, now)
+            entry["failures"] += 1
+            if entry["failures"] >= self.lockout_after:
+                entry["failures"] = 0
+                entry["lockouts"] += 1
+                entry["locked_until"] = now + min(self.lockout_base * 2 ** (entry["lockouts"] - 1), self.lockout_max)
+                self.counters["lockouts"] += 1
+
+    def record_success(self, lockout_key):
+        with self._lock:
+            entry = self._entries.get(lockout_key)
+            if entry:
+                entry["failures"] = 0
+                entry["lockouts"] = 0
+
+    def metrics(self):
+        now = time.monotonic()
+        with self._lock:
+            locked = sum(1 for entry in self._entries.values() if entry["locked_until"] > now)
+            return dict(self.counters, tracked_keys=len(self._entries), locked_keys=locked)
+
+
+login_throttle = LoginThrottle(
+    LOGIN_RATE_PER_MINUTE,
+    LOGIN_BURST,
+    LOGIN_LOCKOUT_AFTER_FAILURES,
+    LOGIN_LOCKOUT_BASE_SECONDS,
+    LOGIN_LOCKOUT_MAX_SECONDS,
+    LOGIN_THROTTLE_MAX_KEYS,
+)
+
+
+def get_client_ip():
+    if TRUST_PROXY_HEADERS and request.headers.get("X-Forwarded-For"):
+        return request.headers["X-Forwarded-For"].split(",")[0].strip()
+    return request.remote_addr
+
+
 @app.route("/admin/login", methods=["GET", "POST"])
 def admin_login():
     if current_user.is_authenticated:
@@ -205,9 +1446,19 @@ def admin_login():
         username = request.form.get("username")
         password = request.form.get("password")
 
+        client_ip = get_client_ip()
+        normalized_username = (username or "").strip().lower()
+        throttle_keys = [f"ip:{client_ip}", f"user:{normalized_username}"]
+        lockout_key = f"pair:{client_ip}|{normalized_username}"
+        retry_after = login_throttle.acquire(throttle_keys, lockout_key)
+        if retry_after:
+            # Counted in login_throttle metrics; the log line is only sampled during a burst
+            app.logger.info("Login throttled for %s; retry in %ds", lockout_key, retry_after, extra={"sample": True})
+            flash(f"Too many login attempts. Please try again in {retry_after} seconds.", "danger")
+            return render_template("admin/login.html"), 429, {"Retry-After": str(retry_after)}
+
         try:
-            user_resp = supabase.table("users").select("*").eq("username", username).single().execute()
-            user = user_resp.data
+            user = users_repo.by_username(username)
         except Exception:
             user = None
 
@@ -220,10 +1471,12 @@ def admin_login():
                 user["role"],
             )
             login_user(user_obj)
+            login_throttle.record_success(lockout_key)
             flash("Login successful!", "success")
             next_page = request.args.get("next")
             return redirect(next_page or url_for("admin_dashboard"))
         else:
+            login_throttle.record_failure(lockout_key)
             flash("Invalid username or password", "danger")
 
     return render_template("admin/login.html")
@@ -240,26 +1493,14 @@ def admin_logout():
 @app.route("/admin/dashboard")
 @login_required
 def admin_dashboard():
-    bulletin_count_resp = supabase.table("bulletin_posts").select("id", count="exact").execute()
-    news_count_resp = supabase.table("news_posts").select("id", count="exact").execute()
-    patch_notes_resp = supabase.table("patch_notes").select("*").order("date", desc=True).execute()
-    system_maintenance_resp = supabase.table("system_maintenance").select("*").order("start_time", desc=True).execute()
-
-    bulletin_count = bulletin_count_resp.count or 0
-    news_count = news_count_resp.count or 0
-    patch_notes = patch_notes_resp.data or []
-    system_maintenance = system_maintenance_resp.data or []
-
-    # Fetch unread notifications
-    unread_notifications_resp = (
-        supabase.table("notifications")
-        .select("*", count="exact")
-        .eq("is_read", False)
-        .order("created_at", desc=True) # Show newest unread first
-        .execute()
-    )
-    unread_notifications = unread_notifications_resp.data or []
-    unread_notifications_count = unread_notifications_resp.count or 0
+    bulletin_count = bulletins_repo.count()
+    news_count = news_repo.count()
+    patch_notes = patch_notes_repo.all()
+    system_maintenance = maintenance_repo.all()
+
+    # Fetch unread notifications, newest first
+    unread_notifications = notifications_repo.unread()
+    unread_notifications_count = notifications_repo.unread_count()
 
 
     return render_template(
@@ -279,18 +1520,12 @@ def mark_notification_as_read(notification_id):
         # Check if notification exists and belongs to the user or is globally updatable by admin
         # For simplicity, we'll assume any admin can mark any notification as read.
         # In a multi-tenant system, you'd add more checks.
-        notification_resp = supabase.table("notifications").select("id").eq("id", notification_id).single().execute()
-        if not notification_resp.data:
+        if not notifications_repo.get(notification_id):
             flash("Notification not found.", "danger")
             return redirect(url_for("admin_dashboard")) # Or return jsonify error if called via JS
 
-        update_resp = supabase.table("notifications").update({"is_read": True}).eq("id", notification_id).execute()
-
-        if hasattr(update_resp, 'data') and update_resp.data:
+        if notifications_repo.mark_read(notification_id):
             flash("Notification marked as read.", "success")
-        elif hasattr(update_resp, 'error') and update_resp.error:
-            app.logger.error(f"Error marking notification {notification_id} as read: {update_resp.error}")
-            flash(f"Error marking notification as read: {update_resp.error.message}", "danger")
         else:
             # This case might occur if the record was already updated or RLS prevented the update without error
             app.logger.warning(f"Notification {notification_id} mark as read returned no data and no error. Might be already read or RLS issue.")
@@ -309,13 +1544,8 @@ def mark_notification_as_read(notification_id):
 def inject_unread_notifications_count():
     if current_user.is_authenticated:
         try:
-            resp = (
-                supabase.table("notifications")
-                .select("id", count="exact")
-                .eq("is_read", False)
-                .execute()
-            )
-            count = resp.count or 0
+            # Rendered on every admin page; the backend coalesces concurrent count queries
+            count = notifications_repo.unread_count()
             return dict(unread_notifications_global_count=count)
         except Exception as e:
             app.logger.error(f"Error fetching unread notifications count for context processor: {e}")
@@ -323,13 +1553,183 @@ def inject_unread_notifications_count():
     return dict(unread_notifications_global_count=0)
 
 
+# Notification Retention
+#
+# Read notifications older than NOTIFICATIONS_RETENTION_DAYS are moved out of the
+# `notifications` table in batches so the unread queries stay small. Archived rows
+# go either to the `notifications_archive` table or to gzipped JSONL files under
+# NOTIFICATIONS_ARCHIVE_DIR (one file per UTC day). The archive table mirrors
+# `notifications` with one extra column:
+#
+#   CREATE TABLE notifications_archive (
+#       id BIGINT PRIMARY KEY,
+#       form_type TEXT NOT NULL,
+#       data JSONB,
+#       is_read BOOLEAN NOT NULL,
+#       created_at TIMESTAMPTZ NOT NULL,
+#       received_at TIMESTAMPTZ,
+#       archived_at TIMESTAMPTZ DEFAULT NOW() NOT NULL
+#   );
+NOTIFICATIONS_RETENTION_DAYS = int(os.getenv("NOTIFICATIONS_RETENTION_DAYS", "90"))
+# "table" or "jsonl". The archive view reads every jsonl file (decompress and
+# parse) on each page load, so that mode only suits small archives; use "table"
+# once the files grow beyond a few MB.
+NOTIFICATIONS_ARCHIVE_MODE = os.getenv("NOTIFICATIONS_ARCHIVE_MODE", "table")
+NOTIFICATIONS_ARCHIVE_BATCH_SIZE = int(os.getenv("NOTIFICATIONS_ARCHIVE_BATCH_SIZE", "500"))
+NOTIFICATIONS_ARCHIVE_DIR = os.getenv("NOTIFICATIONS_ARCHIVE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "archive"))
+# Upper bound on batches per scheduled run so the job fits in one serverless invocation
+NOTIFICATIONS_CRON_MAX_BATCHES = int(os.getenv("NOTIFICATIONS_CRON_MAX_BATCHES", "20"))
+NOTIFICATIONS_ARCHIVE_PAGE_SIZE = 50
+NOTIFICATIONS_ARCHIVE_MODES = ("table", "jsonl")
+
+
+def _append_notifications_jsonl(rows, archived_at):
+    os.makedirs(NOTIFICATIONS_ARCHIVE_DIR, exist_ok=True)
+    path = os.path.join(NOTIFICATIONS_ARCHIVE_DIR, f"notifications-{archived_at:%Y%m%d}.jsonl.gz")
+    # Appending creates a multi-member gzip file, which gzip.open reads back as one stream
+    with gzip.open(path, "at", encoding="utf-8") as fh:
+        for row in rows:
+            fh.write(json.dumps(dict(row, archived_at=archived_at.isoformat()), default=str) + "\n")
+
+
+def compact_notifications(older_than_days=None, mode=None, batch_size=None, max_batches=None, progress=None):
+    """
+    Archive read notifications older than `older_than_days` and delete them from
+    the live table, one batch at a time. Rows are written to the archive before
+    they are deleted, so an interrupted run never loses data. Re-running it is
+    safe: the table archive upserts, and in jsonl mode a batch appended twice
+    is de-duplicated by id when the archive is read.
+    Raises RuntimeError if a batch is archived but not fully deleted.
+    `progress` is called as progress(archived_so_far, batches_done) after each batch.
+    """
+    older_than_days = NOTIFICATIONS_RETENTION_DAYS if older_than_days is None else older_than_days
+    mode = mode or NOTIFICATIONS_ARCHIVE_MODE
+    batch_size = batch_size or NOTIFICATIONS_ARCHIVE_BATCH_SIZE
+    if mode not in NOTIFICATIONS_ARCHIVE_MODES:
+        raise ValueError(f"Unknown notifications archive mode: {mode}")
+
+    cutoff = (datetime.now(pytz.utc) - timedelta(days=older_than_days)).isoformat()
+    archived = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        rows = notifications_repo.read_before(cutoff, batch_size)
+        if not rows:
+            break
+
+        archived_at = datetime.now(pytz.utc)
+        if mode == "table":
+            notifications_archive_repo.archive([dict(row, archived_at=archived_at.isoformat()) for row in rows])
+        else:
+            _append_notifications_jsonl(rows, archived_at)
+
+        deleted = notifications_repo.delete_many([row["id"] for row in rows])
+
+        archived += len(deleted)
+        batches += 1
+        if len(deleted) < len(rows):
+            # e.g. a row-level security policy silently blocking the delete; the next
+            # read_before() would return the same rows forever
+            raise RuntimeError(
+                f"Notification retention: deleted {len(deleted)} of {len(rows)} archived rows in batch {batches} "
+                f"({archived} removed in total); check the delete policy on notifications"
+            )
+        app.logger.info(f"Notification retention: batch {batches} archived {len(rows)} rows ({archived} total) to {mode}")
+        if progress:
+            progress(archived, batches)
+
+    return {"archived": archived, "batches": batches, "mode": mode, "cutoff": cutoff}
+
+
+def query_archived_notifications(form_type=None, page=1, mode=None):
+    """Return (items, total) for one page of archived notifications, newest first."""
+    mode = mode or NOTIFICATIONS_ARCHIVE_MODE
+    start = (page - 1) * NOTIFICATIONS_ARCHIVE_PAGE_SIZE
+    end = start + NOTIFICATIONS_ARCHIVE_PAGE_SIZE
+
+    if mode == "table":
+        return notifications_archive_repo.page(form_type, start, NOTIFICATIONS_ARCHIVE_PAGE_SIZE)
+
+    items = {}
+    for path in sorted(glob.glob(os.path.join(NOTIFICATIONS_ARCHIVE_DIR, "notifications-*.jsonl.gz"))):
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                item = json.loads(line)
+                # A run interrupted between append and delete re-appends its batch; keep the first copy
+                if (not form_type or item.get("form_type") == form_type) and item.get("id") not in items:
+                    items[item.get("id")] = item
+    items = list(items.values())
+    items.sort(key=lambda item: item.get("created_at") or "", reverse=True)
+    return items[start:end], len(items)
+
+
+@app.route("/admin/notifications/archive")
+@login_required
+def admin_notifications_archive():
+    form_type = request.args.get("form_type") or None
+    page = max(request.args.get("page", 1, type=int), 1)
+    try:
+        notifications, total = query_archived_notifications(form_type=form_type, page=page)
+    except Exception as e:
+        app.logger.error(f"Error querying notification archive: {type(e).__name__} - {str(e)}")
+        flash("An error occurred while loading archived notifications.", "danger")
+        notifications, total = [], 0
+
+    page_count = max((total + NOTIFICATIONS_ARCHIVE_PAGE_SIZE - 1) // NOTIFICATIONS_ARCHIVE_PAGE_SIZE, 1)
+    return render_template(
+        "admin/notifications/archive.html",
+        notifications=notifications,
+        total=total,
+        page=page,
+        page_count=page_count,
+        form_type=form_type,
+        retention_days=NOTIFICATIONS_RETENTION_DAYS,
+    )
+
+
+# Scheduled by the "crons" entry in vercel.json; Vercel sends CRON_SECRET as a bearer token
+@app.route("/api/notifications/compact", methods=["GET", "POST"])
+def compact_notifications_job():
+    cron_secret = os.getenv("CRON_SECRET")
+    if not cron_secret:
+        app.logger.error("CRON_SECRET is not set in environment variables.")
+        return jsonify({"error": "Server configuration error"}), 500
+    if request.headers.get("Authorization") != f"Bearer {cron_secret}":
+        return jsonify({"error": "Unauthorized"}), 403
+
+    try:
+        result = compact_notifications(max_batches=NOTIFICATIONS_CRON_MAX_BATCHES)
+        return jsonify(result)
+    except Exception as e:
+        app.logger.error(f"Exception in compact_notifications_job: {type(e).__name__} - {str(e)}")
+        return jsonify({"error": "Notification compaction failed", "details": str(e)}), 500
+
+
+@app.cli.command("compact-notifications")
+@click.option("--days", type=int, default=None, help="Archive read notifications older than this many days.")
+@click.option("--mode", type=click.Choice(NOTIFICATIONS_ARCHIVE_MODES), default=None, help="Archive destination.")
+@click.option("--batch-size", type=int, default=None, help="Rows archived and deleted per batch.")
+@click.option("--max-batches", type=int, default=None, help="Stop after this many batches.")
+def compact_notifications_command(days, mode, batch_size, max_batches):
+    """Move old read notifications into the archive."""
+    try:
+        result = compact_notifications(
+            older_than_days=days,
+            mode=mode,
+            batch_size=batch_size,
+            max_batches=max_batches,
+            progress=lambda archived, batches: click.echo(f"Batch {batches}: {archived} notifications archived"),
+        )
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Done. Archived {result['archived']} notifications created before {result['cutoff']} to {result['mode']}.")
+
+
 # Bulletin Management
 
 @app.route("/admin/bulletins")
 @login_required
 def admin_bulletins():
-    bulletins_resp = supabase.table("bulletin_posts").select("*, image_url").order("date_posted", desc=True).execute()
-    bulletins = bulletins_resp.data or []
+    bulletins = bulletins_repo.all()
     return render_template("admin/bulletins/index.html", bulletins=bulletins)
 
 
@@ -362,7 +1762,8 @@ def admin_create_bulletin():
         if image_url: # Only include image_url if it's not None
             data["image_url"] = image_url
 
-        supabase.table("bulletin_posts").insert(data).execute()
+        bulletins_repo.create(data)
+        regenerate_home_page()
 
         flash("Bulletin created successfully!", "success")
         return redirect(url_for("admin_bulletins"))
@@ -374,8 +1775,7 @@ def admin_create_bulletin():
 @login_required
 def admin_edit_bulletin(id):
     try:
-        resp = supabase.table("bulletin_posts").select("*, image_url").eq("id", id).single().execute()
-        bulletin_from_db = resp.data
+        bulletin_from_db = bulletins_repo.get(id)
     except Exception as e:
         app.logger.error(f"Error fetching bulletin id {id} for edit: {type(e).__name__} - {str(e)}")
         flash(f"An error occurred while fetching bulletin details.", "danger")
@@ -440,14 +1840,9 @@ def admin_edit_bulletin(id):
              return redirect(url_for("admin_bulletins"))
 
         try:
-            response = supabase.table("bulletin_posts").update(update_data_for_db).eq("id", id).execute()
-            # Supabase Python client typically raises an exception for HTTP errors (4xx, 5xx)
-            # but we can add a check for data if needed, though often an empty response.data on UPDATE is normal.
-            if hasattr(response, 'error') and response.error:
-                 app.logger.error(f"Supabase API error updating bulletin {id}: {response.error}")
-                 flash(f"Database update failed: {response.error.message}", "danger")
-                 return render_template("admin/bulletins/edit.html", bulletin=form_data_for_template)
-
+            # The backends raise for HTTP errors (4xx, 5xx); an empty result on UPDATE is normal.
+            bulletins_repo.update(id, update_data_for_db)
+            regenerate_home_page()
             flash("Bulletin updated successfully!", "success")
             return redirect(url_for("admin_bulletins"))
         except Exception as e:
@@ -463,13 +1858,13 @@ def admin_edit_bulletin(id):
 @login_required
 def admin_delete_bulletin(id):
     # Fetch the bulletin to get its image_url before deleting
-    resp = supabase.table("bulletin_posts").select("image_url").eq("id", id).single().execute()
-    bulletin_data = resp.data
+    bulletin_data = bulletins_repo.get(id)
 
     if bulletin_data and bulletin_data.get("image_url"):
         delete_from_supabase_storage(bulletin_data["image_url"], "bulletin-images")
 
-    supabase.table("bulletin_posts").delete().eq("id", id).execute()
+    bulletins_repo.delete(id)
+    regenerate_home_page()
     flash("Bulletin deleted successfully!", "success")
     return redirect(url_for("admin_bulletins"))
 
@@ -479,8 +1874,7 @@ def admin_delete_bulletin(id):
 @app.route("/admin/news")
 @login_required
 def admin_news():
-    news_resp = supabase.table("news_posts").select("*, image_url").order("date_posted", desc=True).execute()
-    news_items = news_resp.data or []
+    news_items = news_repo.all()
     return render_template("admin/news/index.html", news_items=news_items)
 
 
@@ -512,7 +1906,8 @@ def admin_create_news():
         if image_url: # Only include image_url if it's not None
             data["image_url"] = image_url
 
-        supabase.table("news_posts").insert(data).execute()
+        news_repo.create(data)
+        regenerate_home_page()
 
         flash("News item created successfully!", "success")
         return redirect(url_for("admin_news"))
@@ -524,8 +1919,7 @@ def admin_create_news():
 @login_required
 def admin_edit_news(id):
     try:
-        resp = supabase.table("news_posts").select("*, image_url").eq("id", id).single().execute()
-        news_from_db = resp.data
+        news_from_db = news_repo.get(id)
     except Exception as e:
         app.logger.error(f"Error fetching news item id {id} for edit: {type(e).__name__} - {str(e)}")
         flash(f"An error occurred while fetching news item details.", "danger")
@@ -587,12 +1981,8 @@ def admin_edit_news(id):
              return redirect(url_for("admin_news"))
 
         try:
-            response = supabase.table("news_posts").update(update_data_for_db).eq("id", id).execute()
-            if hasattr(response, 'error') and response.error:
-                 app.logger.error(f"Supabase API error updating news item {id}: {response.error}")
-                 flash(f"Database update failed: {response.error.message}", "danger")
-                 return render_template("admin/news/edit.html", news=form_data_for_template)
-
+            news_repo.update(id, update_data_for_db)
+            regenerate_home_page()
             flash("News & Events updated successfully!", "success")
             return redirect(url_for("admin_news"))
         except Exception as e:
@@ -608,28 +1998,45 @@ def admin_edit_news(id):
 @login_required
 def admin_delete_news(id):
     # Fetch the news item to get its image_url before deleting
-    resp = supabase.table("news_posts").select("image_url").eq("id", id).single().execute()
-    news_data = resp.data
+    news_data = news_repo.get(id)
 
     if news_data and news_data.get("image_url"):
         delete_from_supabase_storage(news_data["image_url"], "news-and-events-images")
 
-    supabase.table("news_posts").delete().eq("id", id).execute()
+    news_repo.delete(id)
+    regenerate_home_page()
     flash("News item deleted successfully!", "success")
     return redirect(url_for("admin_news"))
 
 
 # Patch Notes API Endpoints
+#
+# These are polled by every admin page load, so they read through
+# resilient_read() and keep answering from the last good result when
+# Supabase is slow or down.
+ALL_PATCH_NOTES_READ = "patch_notes_repo.all"
+LATEST_PATCH_NOTE_READ = "patch_notes_repo.latest"
+ALL_SYSTEM_MAINTENANCE_READ = "maintenance_repo.all"
+LATEST_SYSTEM_MAINTENANCE_READ = "maintenance_repo.active_or_upcoming"
+
+
+def fetch_latest_system_maintenance():
+    now = datetime.now(pytz.utc).isoformat() # Ensure timezone aware comparison
+    return maintenance_repo.active_or_upcoming(now)
+
+
 @app.route("/api/patch-notes", methods=["GET"])
 @login_required # Assuming only logged-in admins should access this, adjust if needed
 def get_all_patch_notes():
     try:
-        response = supabase.table("patch_notes").select("*").order("date", desc=True).execute()
-        if response.data:
-            return jsonify(response.data)
+        patch_notes = resilient_read(ALL_PATCH_NOTES_READ, patch_notes_repo.all)
+        if patch_notes:
+            return jsonify(patch_notes)
         else:
-            app.logger.error(f"Error fetching all patch notes: {getattr(response, 'error', 'Unknown error')}")
-            return jsonify({"error": "Failed to fetch patch notes", "details": str(getattr(response, 'error', '')) }), 500
+            app.logger.error("Error fetching all patch notes: no patch notes returned")
+            return jsonify({"error": "Failed to fetch patch notes", "details": ""}), 500
+    except SupabaseUnavailable as e:
+        return jsonify({"error": "Patch notes are temporarily unavailable", "details": str(e)}), 503
     except Exception as e:
         app.logger.error(f"Exception in get_all_patch_notes: {str(e)}")
         return jsonify({"error": "An unexpected error occurred", "details": str(e)}), 500
@@ -638,20 +2045,11 @@ def get_all_patch_notes():
 @login_required # Assuming only logged-in admins should access this
 def get_latest_patch_note():
     try:
-        response = supabase.table("patch_notes").select("*").order("date", desc=True).limit(1).single().execute()
-        if response.data:
-            return jsonify(response.data)
-        else:
-            # .single() returns an error in response.error if not found or multiple found
-            # However, PostgrestAPIError might be raised before this for other issues.
-            # If data is empty and no error object, it means no records found which is not an "error" state.
-            if getattr(response, 'error', None):
-                 app.logger.error(f"Error fetching latest patch note: {response.error}")
-                 return jsonify({"error": "Failed to fetch latest patch note", "details": str(response.error)}), 500
-            return jsonify(None), 200 # Return 200 with null body if no patch note exists
+        # Returns 200 with null body if no patch note exists
+        return jsonify(resilient_read(LATEST_PATCH_NOTE_READ, patch_notes_repo.latest)), 200
+    except SupabaseUnavailable as e:
+        return jsonify({"error": "Patch notes are temporarily unavailable", "details": str(e)}), 503
     except Exception as e:
-        # Handle cases where .single() might raise an exception if data is not a single row (though limit(1) should prevent this)
-        # or other unexpected errors.
         app.logger.error(f"Exception in get_latest_patch_note: {str(e)}")
         return jsonify({"error": "An unexpected error occurred", "details": str(e)}), 500
 
@@ -660,12 +2058,14 @@ def get_latest_patch_note():
 @login_required # Assuming only logged-in admins should access this
 def get_all_system_maintenance():
     try:
-        response = supabase.table("system_maintenance").select("*").order("start_time", desc=True).execute()
-        if response.data:
-            return jsonify(response.data)
+        system_maintenance = resilient_read(ALL_SYSTEM_MAINTENANCE_READ, maintenance_repo.all)
+        if system_maintenance:
+            return jsonify(system_maintenance)
         else:
-            app.logger.error(f"Error fetching all system maintenance: {getattr(response, 'error', 'Unknown error')}")
-            return jsonify({"error": "Failed to fetch system maintenance messages", "details": str(getattr(response, 'error', '')) }), 500
+            app.logger.error("Error fetching all system maintenance: no messages returned")
+            return jsonify({"error": "Failed to fetch system maintenance messages", "details": ""}), 500
+    except SupabaseUnavailable as e:
+        return jsonify({"error": "System maintenance messages are temporarily unavailable", "details": str(e)}), 503
     except Exception as e:
         app.logger.error(f"Exception in get_all_system_maintenance: {str(e)}")
         return jsonify({"error": "An unexpected error occurred", "details": str(e)}), 500
@@ -674,52 +2074,196 @@ def get_all_system_maintenance():
 @login_required # Assuming only logged-in admins should access this
 def get_latest_system_maintenance():
     try:
-        now = datetime.now(pytz.utc).isoformat() # Ensure timezone aware comparison
-        # Fetches the most recent maintenance message that is currently active or upcoming.
-        # Orders by start_time descending to get the latest if multiple fit criteria.
-        response = (
-            supabase.table("system_maintenance")
-            .select("*")
-            .lte("start_time", now) # Maintenance should have started
-            .gte("end_time", now)   # And not yet ended
-            .order("start_time", desc=True)
-            .limit(1)
-            .single()
-            .execute()
-        )
-
-        # If no active maintenance, try to find the next upcoming one
-        if not response.data and not getattr(response, 'error', None):
-            response = (
-                supabase.table("system_maintenance")
-                .select("*")
-                .gt("start_time", now) # Future start time
-                .order("start_time", desc=False) # Ascending to get the soonest
-                .limit(1)
-                .single()
-                .execute()
-            )
-
-        if response.data:
-            return jsonify(response.data)
-        else:
-            if getattr(response, 'error', None):
-                app.logger.error(f"Error fetching latest system maintenance: {response.error}")
-                # Distinguish between "not found" and actual errors if possible,
-                # but .single() can make this tricky. For now, a generic error.
-                return jsonify({"error": "Failed to fetch latest system maintenance", "details": str(response.error)}), 500
-            return jsonify(None), 200 # Return 200 with null body if no relevant maintenance message exists
-
+        # Returns 200 with null body if no relevant maintenance message exists
+        return jsonify(resilient_read(LATEST_SYSTEM_MAINTENANCE_READ, fetch_latest_system_maintenance)), 200
+    except SupabaseUnavailable as e:
+        return jsonify({"error": "System maintenance messages are temporarily unavailable", "details": str(e)}), 503
     except Exception as e:
         app.logger.error(f"Exception in get_latest_system_maintenance: {str(e)}")
         return jsonify({"error": "An unexpected error occurred", "details": str(e)}), 500
 
+# Response Compression
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+COMPRESSION_CACHE_SIZE = int(os.getenv("COMPRESSION_CACHE_SIZE", "64"))
+# Passthrough (file) responses up to this size are buffered so their compressed body can be cached
+COMPRESSION_BUFFER_LIMIT = 1024 * 1024
+COMPRESSION_MIMETYPES = {
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+}
+
+# (ETag or body digest, encoding) -> compressed body, least recently used first
+compression_cache = OrderedDict()
+compression_cache_lock = threading.Lock()
+compression_stats = {
+    "responses": 0,
+    "streamed_responses": 0,
+    "cache_hits": 0,
+    "bytes_in": 0,
+    "bytes_out": 0,
+    "cpu_seconds": 0.0,
+    "by_encoding": {"br": 0, "gzip": 0},
+}
+compression_stats_lock = threading.Lock()
+
+
+def _record_compression(encoding, bytes_in, bytes_out, cpu_seconds, cache_hit=False, streamed=False):
+    with compression_stats_lock:
+        compression_stats["responses"] += 1
+        compression_stats["streamed_responses"] += int(streamed)
+        compression_stats["cache_hits"] += int(cache_hit)
+        compression_stats["bytes_in"] += bytes_in
+        compression_stats["bytes_out"] += bytes_out
+        compression_stats["cpu_seconds"] += cpu_seconds
+        compression_stats["by_encoding"][encoding] += 1
+
+
+def compression_metrics():
+    with compression_stats_lock:
+        stats = dict(compression_stats, by_encoding=dict(compression_stats["by_encoding"]))
+    stats["ratio"] = round(stats["bytes_out"] / stats["bytes_in"], 4) if stats["bytes_in"] else None
+    compressed = stats["responses"] - stats["cache_hits"]
+    stats["avg_cpu_ms"] = round(stats["cpu_seconds"] * 1000 / compressed, 3) if compressed else None
+    stats["brotli_available"] = brotli is not None
+    return stats
+
+
+def _choose_encoding(accept_encodings=None):
+    if accept_encodings is None:
+        accept_encodings = request.accept_encodings
+    # Highest q-value wins; on a tie br comes first because it compresses better
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    encoding = max(candidates, key=lambda name: accept_encodings[name])
+    return encoding if accept_encodings[encoding] else None
+
+
+def _compressor(encoding):
+    """Return (compress, flush, finish) callables for a fresh compression stream."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+        return compressor.process, compressor.flush, compressor.finish
+    # wbits=31 selects the gzip container
+    compressor = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+def _compress_body(body, encoding):
+    compress, _, finish = _compressor(encoding)
+    return compress(body) + finish()
+
+
+def _compress_stream(chunks, encoding):
+    # Flush after every chunk so clients receive streamed output as it is produced
+    compress, flush, finish = _compressor(encoding)
+    bytes_in = bytes_out = 0
+    cpu_seconds = 0.0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            start = time.thread_time()
+            out = compress(chunk) + flush()
+            cpu_seconds += time.thread_time() - start
+            bytes_in += len(chunk)
+            bytes_out += len(out)
+            if out:
+                yield out
+        start = time.thread_time()
+        out = finish()
+        cpu_seconds += time.thread_time() - start
+        bytes_out += len(out)
+        yield out
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+        _record_compression(encoding, bytes_in, bytes_out, cpu_seconds, streamed=True)
+
+
+@app.after_request
+def compress_response(response):
+    if response.mimetype not in COMPRESSION_MIMETYPES:
+        return response
+    response.vary.add("Accept-Encoding")
+    if (
+        request.method == "HEAD"
+        or response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+    if response.content_length is not None and response.content_length < COMPRESSION_MIN_SIZE:
+        return response
+
+    buffered = not (response.direct_passthrough or response.is_streamed)
+    if response.direct_passthrough and (response.content_length or COMPRESSION_BUFFER_LIMIT + 1) <= COMPRESSION_BUFFER_LIMIT:
+        response.direct_passthrough = False
+        buffered = True
+
+    if not buffered:
+        response.response = _compress_stream(response.iter_encoded(), encoding)
+        response.direct_passthrough = False
+        response.headers.pop("Content-Length", None)
+    else:
+        body = response.get_data()
+        if len(body) < COMPRESSION_MIN_SIZE:
+            return response
+        etag, weak = response.get_etag()
+        cache_key = (etag or hashlib.sha1(body).hexdigest(), encoding)
+        with compression_cache_lock:
+            compressed = compression_cache.get(cache_key)
+            if compressed is not None:
+                compression_cache.move_to_end(cache_key)
+        if compressed is not None:
+            _record_compression(encoding, len(body), len(compressed), 0.0, cache_hit=True)
+        else:
+            start = time.thread_time()
+            compressed = _compress_body(body, encoding)
+            _record_compression(encoding, len(body), len(compressed), time.thread_time() - start)
+            with compression_cache_lock:
+                compression_cache[cache_key] = compressed
+                while len(compression_cache) > COMPRESSION_CACHE_SIZE:
+                    compression_cache.popitem(last=False)
+        response.set_data(compressed)
+        if etag and not weak:
+            # The encoded body differs byte-for-byte from the identity one
+            response.set_etag(etag, weak=True)
+
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+@app.route("/api/metrics", methods=["GET"])
+@login_required
+def get_metrics():
+    return jsonify({
+        "compression": compression_metrics(),
+        "login_throttle": login_throttle.metrics(),
+        "supabase": resilience_metrics(),
+        "replica": replica_sync.metrics() if replica_sync else None,
+        "profiling": profiling_metrics(),
+        "logging": {
+            "structured": STRUCTURED_LOGGING,
+            "queued": log_queue_handler.queue.qsize() if log_queue_handler else 0,
+            "dropped": log_queue_handler.dropped if log_queue_handler else 0,
+        },
+    })
+
 # Setup initial admin user
 
 @app.route("/setup", methods=["GET", "POST"])
 def setup():
-    users_resp = supabase.table("users").select("id").limit(1).execute()
-    if users_resp.data and len(users_resp.data) > 0:
+    if users_repo.exists():
         flash("Setup has already been completed", "warning")
         return redirect(url_for("index"))
 
@@ -742,7 +2286,7 @@ def setup():
             "role": "admin",
         }
 
-        supabase.table("users").insert(data).execute()
+        users_repo.create(data)
 
         flash("Initial setup completed. You can now log in.", "success")
         return redirect(url_for("admin_login"))
@@ -754,23 +2298,199 @@ def setup():
 def internal_error(error):
     return f"500 error: {error}", 500
 
+DATETIMEFORMAT_CACHE_SIZE = int(os.getenv("DATETIMEFORMAT_CACHE_SIZE", "4096"))
+
+
+def _to_manila(dt):
+    # Ensure timezone‑aware, then convert
+    if dt.tzinfo is None:
+        dt = MANILA_TZ.localize(dt)
+    return dt.astimezone(MANILA_TZ)
+
+
+# List pages format the same few timestamps over and over; parse each string once
+@functools.lru_cache(maxsize=DATETIMEFORMAT_CACHE_SIZE)
+def _format_iso_manila(value, format):
+    return _to_manila(parser.isoparse(value)).strftime(format)
+
+
 @app.template_filter("datetimeformat")
 def datetimeformat(value, format="%B %d, %Y %I:%M %p"):
     """
     Convert an ISO‑8601 string or datetime into Asia/Manila time,
     then format it for display.
     """
-    manila = pytz.timezone("Asia/Manila")
-    # Accept either str or datetime
-    if isinstance(value, str):
-        dt = parser.isoparse(value)
+    with profile_span("filter:datetimeformat"):
+        # Accept either str or datetime
+        if isinstance(value, str):
+            return _format_iso_manila(value, format)
+        return _to_manila(value).strftime(format)
+
+# Asset Bundles
+#
+# `flask build-assets` writes content-hashed bundles to static/dist and records
+# them in static/dist/manifest.json; templates reference them via asset_url().
+# First-party bundles are built from files under static/. Vendor files are
+# downloaded once and self-hosted, with Font Awesome reduced to the icons the
+# templates actually use. Until a bundle is built, asset_url() falls back to
+# its unbundled source or CDN URL.
+ASSET_DIST_DIR = os.path.join(app.static_folder, "dist")
+ASSET_MANIFEST_PATH = os.path.join(ASSET_DIST_DIR, "manifest.json")
+ASSET_BUNDLES = {
+    "admin.css": ["admin/admin.css"],
+    "admin.js": ["admin/sidebar.js", "admin/popups.js"],
+}
+VENDOR_ASSETS = {
+    "bootstrap.min.css": "https://cdn.jsdelivr.net/npm/bootstrap@5.3.8/dist/css/bootstrap.min.css",
+    "bootstrap.bundle.min.js": "https://cdn.jsdelivr.net/npm/bootstrap@5.3.8/dist/js/bootstrap.bundle.min.js",
+    "fontawesome.min.css": "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css",
+}
+ICON_CLASS_PATTERN = re.compile(r"\bfa-[a-z0-9-]+")
+
+
+def load_asset_manifest():
+    try:
+        with open(ASSET_MANIFEST_PATH, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+asset_manifest = load_asset_manifest()
+
+
+@app.template_global()
+def asset_url(name):
+    if name in asset_manifest:
+        return url_for("static", filename=f"dist/{asset_manifest[name]}")
+    if name in VENDOR_ASSETS:
+        return VENDOR_ASSETS[name]
+    # Unbuilt first-party bundles only ever have a single source file in dev
+    return url_for("static", filename=ASSET_BUNDLES[name][0])
+
+
+@app.after_request
+def cache_hashed_assets(response):
+    if request.path.startswith("/static/dist/") and response.status_code == 200 and not request.path.endswith("manifest.json"):
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+        response.cache_control.no_cache = None
+    return response
+
+
+def _write_hashed_asset(name, content):
+    digest = hashlib.sha256(content).hexdigest()[:10]
+    stem, ext = os.path.splitext(name)
+    hashed_name = f"{stem}.{digest}{ext}"
+    target = os.path.join(ASSET_DIST_DIR, hashed_name)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, "wb") as fh:
+        fh.write(content)
+    return hashed_name
+
+
+def _download(url):
+    with urllib.request.urlopen(url, timeout=30) as resp:
+        return resp.read()
+
+
+def _minify_css(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    return "\n".join(line.strip() for line in css.splitlines() if line.strip()) + "\n"
+
+
+def _used_icon_classes():
+    used = set()
+    for folder in (app.template_folder, app.static_folder):
+        for root, _, files in os.walk(os.path.join(app.root_path, folder)):
+            if root.startswith(ASSET_DIST_DIR):
+                continue
+            for filename in files:
+                if filename.endswith((".html", ".js")):
+                    with open(os.path.join(root, filename), encoding="utf-8") as fh:
+                        used.update(ICON_CLASS_PATTERN.findall(fh.read()))
+    return used
+
+
+def _css_blocks(css):
+    """Split a stylesheet into (prelude, body) pairs for its top-level blocks."""
+    blocks = []
+    depth = 0
+    start = 0
+    prelude = ""
+    for i, char in enumerate(css):
+        if char == "{":
+            if depth == 0:
+                prelude = css[start:i]
+                start = i + 1
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                blocks.append((prelude.strip(), css[start:i]))
+                start = i + 1
+    return blocks
+
+
+def _subset_fontawesome(css, css_url, used_icons):
+    """Keep only icon rules for `used_icons` and self-host the woff2 webfonts."""
+    rules = []
+    for prelude, body in _css_blocks(css):
+        if prelude == "@font-face":
+            font_urls = re.findall(r"url\(([^)]+\.woff2)\)", body)
+            if not font_urls:
+                continue
+            font_name = os.path.basename(font_urls[0])
+            font_file = _write_hashed_asset(f"webfonts/{font_name}", _download(urllib.parse.urljoin(css_url, font_urls[0])))
+            body = re.sub(r"src:[^;}]+", f"src:url({font_file}) format(\"woff2\")", body)
+        elif not prelude.startswith("@") and all(re.fullmatch(r"\.fa-[a-z0-9-]+::?before", sel) for sel in prelude.split(",")):
+            selectors = [sel for sel in prelude.split(",") if sel.split(":")[0][1:] in used_icons]
+            if not selectors:
+                continue
+            prelude = ",".join(selectors)
+        rules.append(f"{prelude}{{{body}}}")
+    return "".join(rules)
+
+
+def build_assets(include_vendor=True):
+    manifest = {}
+    for name, sources in ASSET_BUNDLES.items():
+        parts = []
+        for source in sources:
+            with open(os.path.join(app.static_folder, source), encoding="utf-8") as fh:
+                parts.append(fh.read())
+        content = "\n".join(parts)
+        if name.endswith(".css"):
+            content = _minify_css(content)
+        manifest[name] = _write_hashed_asset(name, content.encode("utf-8"))
+
+    if include_vendor:
+        used_icons = _used_icon_classes()
+        for name, url in VENDOR_ASSETS.items():
+            content = _download(url)
+            if name == "fontawesome.min.css":
+                content = _subset_fontawesome(content.decode("utf-8"), url, used_icons).encode("utf-8")
+            manifest[name] = _write_hashed_asset(name, content)
     else:
-        dt = value
-    # Ensure timezone‑aware, then convert
-    if dt.tzinfo is None:
-        dt = manila.localize(dt)
-    dt = dt.astimezone(manila)
-    return dt.strftime(format)
+        # Keep previously built vendor files rather than dropping them from the manifest
+        manifest.update({name: path for name, path in load_asset_manifest().items() if name in VENDOR_ASSETS})
+
+    with open(ASSET_MANIFEST_PATH, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+    asset_manifest.clear()
+    asset_manifest.update(manifest)
+    return manifest
+
+
+@app.cli.command("build-assets")
+@click.option("--skip-vendor", is_flag=True, help="Only rebuild first-party bundles; keep vendor files as they are.")
+def build_assets_command(skip_vendor):
+    """Build versioned static bundles and the asset manifest."""
+    for name, hashed_name in build_assets(include_vendor=not skip_vendor).items():
+        click.echo(f"{name} -> dist/{hashed_name}")
+
 
 @app.route("/credits")
 def credit():
@@ -787,6 +2507,113 @@ def about():
 def coming_soon():
     return render_template("coming_soon.html")
 
+# Static Export
+#
+# Public pages are rendered to plain HTML under STATIC_EXPORT_DIR so they can be
+# served straight from the CDN (see the routes in vercel.json) without invoking
+# the Python function. Vercel has no build step for them: the exported about,
+# credits and coming_soon pages are committed, so re-run
+# `flask export-static --skip-home` after changing their templates or assets.
+# `flask export-static --check` (and the test suite) fails while they are stale.
+#
+# The home page is not routed to the CDN: its posts change between deploys, and
+# the Vercel function filesystem is read-only, so an exported copy there could
+# never be refreshed. On Vercel `/` always runs the function (backed by the
+# read cache). On a long-running server, STATIC_EXPORT=1 serves the home page
+# from its exported copy, which is regenerated whenever a bulletin or news item
+# is created, edited or deleted. That requires STATIC_EXPORT_DIR to be writable
+# and shared by every process serving the app; if regeneration fails, the stale
+# copy is removed and the page is rendered live until the next publish.
+STATIC_EXPORT_ENABLED = os.getenv("STATIC_EXPORT", "0") == "1"
+STATIC_EXPORT_DIR = os.getenv("STATIC_EXPORT_DIR", os.path.join(app.static_folder, "pages"))
+# Set when this process could not refresh or remove a stale index.html
+static_home_stale = False
+# exported filename -> (path, function that renders it)
+STATIC_EXPORT_PAGES = {
+    "index.html": ("/", render_home_page),
+    "about.html": ("/about", about),
+    "credits.html": ("/credits", credit),
+    "coming_soon.html": ("/coming_soon", coming_soon),
+}
+
+
+def render_static_page(filename):
+    path, render = STATIC_EXPORT_PAGES[filename]
+    with app.test_request_context(path):
+        html = render()
+    if not isinstance(html, str):
+        # A (body, status) tuple means the page rendered in a degraded state; keep the old copy
+        raise SupabaseUnavailable(f"{path} could not be rendered with live data")
+    return html
+
+
+def stale_static_pages():
+    """Return the committed pages whose file is missing or differs from a fresh render."""
+    stale = []
+    for filename in STATIC_EXPORT_PAGES:
+        if filename == "index.html":
+            continue
+        try:
+            with open(os.path.join(STATIC_EXPORT_DIR, filename), encoding="utf-8") as fh:
+                current = fh.read()
+        except FileNotFoundError:
+            current = None
+        if current != render_static_page(filename):
+            stale.append(filename)
+    return stale
+
+
+def export_static_page(filename):
+    html = render_static_page(filename)
+    os.makedirs(STATIC_EXPORT_DIR, exist_ok=True)
+    target = os.path.join(STATIC_EXPORT_DIR, filename)
+    # Write to a temporary file and swap it in so readers never see a partial page
+    tmp_target = f"{target}.{os.getpid()}.tmp"
+    with open(tmp_target, "w", encoding="utf-8") as fh:
+        fh.write(html)
+    os.replace(tmp_target, target)
+    return target
+
+
+def regenerate_home_page():
+    global static_home_stale
+    invalidate_reads(HOME_BULLETINS_READ, HOME_NEWS_READ)
+    if not STATIC_EXPORT_ENABLED:
+        return
+    try:
+        export_static_page("index.html")
+        static_home_stale = False
+        app.logger.info("Static export: regenerated index.html")
+    except Exception as e:
+        app.logger.error(f"Static export: failed to regenerate index.html: {type(e).__name__} - {str(e)}")
+        # Remove the stale copy so index() renders the page live until the next publish
+        try:
+            os.remove(os.path.join(STATIC_EXPORT_DIR, "index.html"))
+        except FileNotFoundError:
+            pass
+        except OSError as remove_error:
+            # e.g. a read-only filesystem; at least stop serving it from this process
+            static_home_stale = True
+            app.logger.error(f"Static export: could not remove stale index.html: {remove_error}")
+
+
+@app.cli.command("export-static")
+@click.option("--skip-home", is_flag=True, help="Only export pages without data dependencies.")
+@click.option("--check", is_flag=True, help="Fail if the exported static pages are missing or out of date.")
+def export_static_command(skip_home, check):
+    """Render public pages to static HTML files."""
+    if check:
+        stale = stale_static_pages()
+        if stale:
+            raise click.ClickException(f"Out of date: {', '.join(stale)}; run `flask export-static --skip-home`")
+        click.echo("Static pages are up to date")
+        return
+    for filename in STATIC_EXPORT_PAGES:
+        if skip_home and filename == "index.html":
+            continue
+        click.echo(f"Exported {export_static_page(filename)}")
+
+
 @app.route("/admin/brgy_certificate_requests")
 @login_required
 def brgy_certificate_requests():
@@ -803,8 +2630,11 @@ def reports_and_concerns():
     return render_template("admin/reports_and_concerns.html")
 
 # --- Google Form Notification Webhook ---
-@app.route("/api/notifications/google-form", methods=["POST"])
-def google_form_notification():
+def parse_google_form_notification(payload):
+    """
+    Validate a webhook payload from Google Apps Script. Returns
+    (notification row to insert, None) or (None, (error body, status code)).
+    """
     # Basic security: Check for a secret key in the request headers or payload
     # For this example, we'll expect it in the JSON payload from Google Apps Script
     # In a production app, consider using request headers for the secret key.
@@ -813,89 +2643,422 @@ def google_form_notification():
     EXPECTED_API_SECRET_KEY = os.getenv("GOOGLE_APPS_SCRIPT_SECRET_KEY")
     if not EXPECTED_API_SECRET_KEY:
         app.logger.error("GOOGLE_APPS_SCRIPT_SECRET_KEY is not set in environment variables.")
-        return jsonify({"error": "Server configuration error"}), 500
-
-    try:
-        payload = request.get_json()
-        if not payload:
-            app.logger.warning("Webhook: Received empty payload.")
-            return jsonify({"error": "Empty payload"}), 400
-
-        submitted_secret_key = payload.get("secret_key")
-        if submitted_secret_key != EXPECTED_API_SECRET_KEY:
-            app.logger.warning(f"Webhook: Invalid secret key. Submitted: {submitted_secret_key}")
-            return jsonify({"error": "Unauthorized"}), 403
-
-        form_type = payload.get("form_type")
-        submission_timestamp_str = payload.get("submission_timestamp")
-        form_data = payload.get("data")
-
-        if not form_type or not form_data:
-            app.logger.warning(f"Webhook: Missing form_type or data in payload. Form Type: {form_type}")
-            return jsonify({"error": "Missing required fields: form_type, data"}), 400
-
-        # Attempt to parse the submission_timestamp
-        # The Google Apps Script sends it as a string, potentially localized.
-        # We'll try to parse it; if it fails, we'll default to None, and Supabase will use its default.
-        created_at_dt = None
-        if submission_timestamp_str:
-            try:
-                # Using dateutil.parser which is quite flexible
-                created_at_dt = parser.isoparse(submission_timestamp_str)
-                # Ensure it's timezone-aware, defaulting to UTC if not specified
-                if created_at_dt.tzinfo is None:
-                    created_at_dt = pytz.utc.localize(created_at_dt)
-            except ValueError:
-                app.logger.warning(f"Webhook: Could not parse submission_timestamp '{submission_timestamp_str}'. Will use current time for 'created_at'.")
-                # If parsing fails, created_at_dt remains None, Supabase will use its default for created_at if the column definition allows
-                # However, our table has `created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL`.
-                # If we want to store the original string when parsing fails, the table schema needs a different column.
-                # For now, if parsing fails, Supabase's DEFAULT NOW() for `created_at` will be used.
-                # `received_at` will always be NOW() by the database.
-
-        notification_data_to_insert = {
-            "form_type": form_type,
-            "data": form_data, # This should be the e.namedValues from Google Apps Script
-            "is_read": False,
-            # If created_at_dt is successfully parsed, use it. Otherwise, Supabase default will apply.
-            # Supabase client might require an ISO format string for timestamps.
-        }
-        if created_at_dt:
-            notification_data_to_insert["created_at"] = created_at_dt.isoformat()
+        return None, ({"error": "Server configuration error"}, 500)
+
+    if not payload:
+        app.logger.warning("Webhook: Received empty payload.")
+        return None, ({"error": "Empty payload"}, 400)
+
+    submitted_secret_key = payload.get("secret_key")
+    if submitted_secret_key != EXPECTED_API_SECRET_KEY:
+        app.logger.warning("Webhook: Invalid secret key. Submitted: %s", LogPayload(submitted_secret_key, 64))
+        return None, ({"error": "Unauthorized"}, 403)
+
+    form_type = payload.get("form_type")
+    submission_timestamp_str = payload.get("submission_timestamp")
+    form_data = payload.get("data")
+
+    if not form_type or not form_data:
+        app.logger.warning("Webhook: Missing form_type or data in payload. Form Type: %s", LogPayload(form_type, 64))
+        return None, ({"error": "Missing required fields: form_type, data"}, 400)
+
+    # Attempt to parse the submission_timestamp
+    # The Google Apps Script sends it as a string, potentially localized.
+    # We'll try to parse it; if it fails, we'll default to None, and Supabase will use its default.
+    created_at_dt = None
+    if submission_timestamp_str:
+        try:
+            # Using dateutil.parser which is quite flexible
+            created_at_dt = parser.isoparse(submission_timestamp_str)
+            # Ensure it's timezone-aware, defaulting to UTC if not specified
+            if created_at_dt.tzinfo is None:
+                created_at_dt = pytz.utc.localize(created_at_dt)
+        except ValueError:
+            app.logger.warning("Webhook: Could not parse submission_timestamp '%s'. Will use current time for 'created_at'.", LogPayload(submission_timestamp_str, 64))
+            # If parsing fails, created_at_dt remains None, Supabase will use its default for created_at if the column definition allows
+            # However, our table has `created_at TIMESTAMPTZ DEFAULT NOW() NOT NULL`.
+            # If we want to store the original string when parsing fails, the table schema needs a different column.
+            # For now, if parsing fails, Supabase's DEFAULT NOW() for `created_at` will be used.
+            # `received_at` will always be NOW() by the database.
+
+    notification_data_to_insert = {
+        "form_type": form_type,
+        "data": form_data, # This should be the e.namedValues from Google Apps Script
+        "is_read": False,
+        # If created_at_dt is successfully parsed, use it. Otherwise, Supabase default will apply.
+        # Supabase client might require an ISO format string for timestamps.
+    }
+    if created_at_dt:
+        notification_data_to_insert["created_at"] = created_at_dt.isoformat()
+
+    # `received_at` will be set by the database default (NOW())
+
+    app.logger.info("Webhook: Received valid notification for form_type: %s. Inserting into Supabase.", form_type, extra={"sample": True})
+    return notification_data_to_insert, None
+
+
+def google_form_notification_result(inserted):
+    # Check if the insert was successful (the backends return the inserted rows on success)
+    if inserted:
+        app.logger.info("Webhook: Notification successfully inserted. Response: %s", LogPayload(inserted), extra={"sample": True})
+        return {"message": "Notification received and stored successfully", "id": inserted[0].get('id')}, 201
+    app.logger.error("Webhook: Insert returned no rows and raised no error.")
+    return {"error": "Failed to store notification in database, unknown reason"}, 500
 
-        # `received_at` will be set by the database default (NOW())
 
-        app.logger.info(f"Webhook: Received valid notification for form_type: {form_type}. Inserting into Supabase.")
+@app.route("/api/notifications/google-form", methods=["POST"])
+def google_form_notification():
+    try:
+        notification_data_to_insert, error = parse_google_form_notification(request.get_json())
+        if error:
+            return jsonify(error[0]), error[1]
 
         try:
-            insert_response = supabase.table("notifications").insert(notification_data_to_insert).execute()
-
-            # Check if the insert was successful (Supabase typically returns data on success)
-            if hasattr(insert_response, 'data') and insert_response.data:
-                app.logger.info(f"Webhook: Notification successfully inserted. Response: {insert_response.data}")
-                return jsonify({"message": "Notification received and stored successfully", "id": insert_response.data[0].get('id')}), 201
-            elif hasattr(insert_response, 'error') and insert_response.error:
-                app.logger.error(f"Webhook: Supabase insert error: {insert_response.error}")
-                return jsonify({"error": "Failed to store notification in database", "details": str(insert_response.error)}), 500
-            else:
-                app.logger.error(f"Webhook: Supabase insert failed with no specific error data. Response: {insert_response}")
-                return jsonify({"error": "Failed to store notification in database, unknown reason"}), 500
+            body, status = google_form_notification_result(notifications_repo.create(notification_data_to_insert))
+            return jsonify(body), status
 
         except Exception as db_e:
-            app.logger.error(f"Webhook: Database exception during insert: {type(db_e).__name__} - {str(db_e)}")
-            app.logger.error(traceback.format_exc())
+            app.logger.error("Webhook: Database exception during insert: %s - %s", type(db_e).__name__, db_e, exc_info=True)
             return jsonify({"error": "Database operation failed"}), 500
 
     except Exception as e:
-        app.logger.error(f"Webhook: General exception: {type(e).__name__} - {str(e)}")
-        app.logger.error(traceback.format_exc())
+        app.logger.error("Webhook: General exception: %s - %s", type(e).__name__, e, exc_info=True)
         return jsonify({"error": "An unexpected error occurred on the server"}), 500
 
-mode = "prod"
+# ASGI Serving
+#
+# `asgi_app` serves the I/O-bound hot paths (home page, Google Form webhook and
+# the admin JSON APIs) as native coroutines over the async Supabase client, so a
+# single uvicorn process keeps hundreds of them in flight on one event loop
+# instead of one waitress thread each. Every other route, and every request
+# that needs Flask-Login's full machinery (no session cookie, remember-me
+# logins), runs the regular Flask app on a small thread pool via a2wsgi. Reads
+# share the read cache, single-flight stats and circuit breaker with the WSGI
+# side, and responses match the WSGI views byte for byte before compression.
+#
+#   SERVER_MODE=asgi python main.py     or     uvicorn main:asgi_app --workers 2
+#
+# With DATA_BACKEND=sqlite there is no Supabase to wait on, so everything is
+# served through the WSGI bridge.
+ASGI_SUPABASE_MAX_CONNECTIONS = int(os.getenv("ASGI_SUPABASE_MAX_CONNECTIONS", "100"))
+ASGI_WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", "10"))
+
+
+class AsyncSupabaseBackend(SupabaseBackend):
+    """SupabaseBackend over an async client; the methods are coroutines."""
+
+    async def select(self, table, filters=(), order=(), limit=None, offset=0):
+        async def fetch():
+            return (await self._select_query(table, filters, order, limit, offset).execute()).data or []
+        return await async_single_flight(query_key(table, filters, order, limit, offset), fetch)
+
+    async def count(self, table, filters=()):
+        async def fetch():
+            return (await self._count_query(table, filters).execute()).count or 0
+        return await async_single_flight(query_key(table, filters, count=True), fetch)
+
+    async def insert(self, table, data):
+        return (await self.client.table(table).insert(data).execute()).data or []
+
+
+async_backend = AsyncSupabaseBackend(None)
+async_backend_lock = asyncio.Lock()
+async_single_flights = {}
+# Background refresh tasks; the event loop only keeps weak references
+async_refresh_tasks = set()
+
+
+async def get_async_backend():
+    # Created on the serving loop; lifespan startup does this before the first request
+    if async_backend.client is None:
+        async with async_backend_lock:
+            if async_backend.client is None:
+                # Shared by the PostgREST client only; storage and functions would
+                # repoint its base_url, so uploads stay on the synchronous client
+                http_client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=ASGI_SUPABASE_MAX_CONNECTIONS,
+                        max_keepalive_connections=ASGI_SUPABASE_MAX_CONNECTIONS,
+                    ),
+                    timeout=SUPABASE_TIMEOUT,
+                )
+                async_backend.client = await acreate_client(
+                    SUPABASE_URL,
+                    SUPABASE_KEY,
+                    options=AsyncClientOptions(httpx_client=http_client, postgrest_client_timeout=SUPABASE_TIMEOUT),
+                )
+    return async_backend
+
+
+async def close_async_backend():
+    if async_backend.client is not None:
+        await async_backend.client.options.httpx_client.aclose()
+        async_backend.client = None
+
+
+async def async_single_flight(key, fetch, timeout=None):
+    """single_flight() for coroutine functions; waiters share the leader's task."""
+    task = async_single_flights.get(key)
+    with single_flights_lock:
+        if task is None:
+            single_flight_stats["leaders"] += 1
+        else:
+            single_flight_stats["coalesced"] += 1
+    if task is None:
+        task = async_single_flights[key] = asyncio.ensure_future(fetch())
+        task.add_done_callback(lambda _: async_single_flights.pop(key, None))
+    try:
+        # shield: a waiter timing out or disconnecting must not cancel the shared query
+        return await asyncio.wait_for(asyncio.shield(task), SINGLE_FLIGHT_TIMEOUT if timeout is None else timeout)
+    except asyncio.TimeoutError:
+        with single_flights_lock:
+            single_flight_stats["timeouts"] += 1
+        raise SupabaseUnavailable(f"Timed out waiting for in-flight read {key}")
+
+
+async def _refresh_read_async(key, fetch):
+    try:
+        data = await async_single_flight(key, lambda: supabase_breaker.acall(fetch))
+        with read_cache_lock:
+            read_cache[key] = (data, time.monotonic())
+    except Exception as e:
+        with read_cache_lock:
+            read_cache_stats["refresh_failures"] += 1
+        app.logger.warning("Background refresh of %s failed: %s - %s", key, type(e).__name__, e)
+    finally:
+        with read_cache_lock:
+            read_refreshes_in_flight.discard(key)
+
+
+async def resilient_read_async(key, fetch, ttl=None):
+    """resilient_read() for coroutine functions, sharing its cache and breaker."""
+    cached, refresh = _lookup_read(key, ttl)
+    if cached:
+        if refresh:
+            task = asyncio.ensure_future(_refresh_read_async(key, fetch))
+            async_refresh_tasks.add(task)
+            task.add_done_callback(async_refresh_tasks.discard)
+        return cached[0]
+
+    data = await async_single_flight(key, lambda: supabase_breaker.acall(fetch))
+    with read_cache_lock:
+        read_cache[key] = (data, time.monotonic())
+    return data
+
+
+# Async counterparts of the repository reads behind the native routes
+async def fetch_active_posts_async(table, limit=8):
+    backend = await get_async_backend()
+    return await backend.select(table, [("eq", "is_active", True)], [("date_posted", True)], limit)
+
+
+async def fetch_all_patch_notes_async():
+    backend = await get_async_backend()
+    return await backend.select("patch_notes", order=[("date", True)])
+
+
+async def fetch_latest_patch_note_async():
+    backend = await get_async_backend()
+    rows = await backend.select("patch_notes", order=[("date", True)], limit=1)
+    return rows[0] if rows else None
+
+
+async def fetch_all_system_maintenance_async():
+    backend = await get_async_backend()
+    return await backend.select("system_maintenance", order=[("start_time", True)])
+
+
+async def fetch_latest_system_maintenance_async():
+    backend = await get_async_backend()
+    now = datetime.now(pytz.utc).isoformat()
+    rows = await backend.select("system_maintenance", [("lte", "start_time", now), ("gte", "end_time", now)], [("start_time", True)], 1)
+    if not rows:
+        rows = await backend.select("system_maintenance", [("gt", "start_time", now)], [("start_time", False)], 1)
+    return rows[0] if rows else None
+
+
+async def fetch_user_async(user_id):
+    backend = await get_async_backend()
+    rows = await backend.select("users", [("eq", "id", user_id)], limit=1)
+    return rows[0] if rows else None
+
+
+def _asgi_json(data, status=200):
+    # Same serializer, separators and trailing newline as jsonify()
+    return status, "application/json", (app.json.dumps(data, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _asgi_headers(scope):
+    return Headers([(name.decode("latin-1"), value.decode("latin-1")) for name, value in scope["headers"]])
+
+
+async def _asgi_session_user(scope):
+    """
+    Return the logged-in user row for the request's Flask session cookie, or
+    None when only the WSGI login flow can decide (which then redirects or
+    restores a remember-me login as usual).
+    """
+    serializer = app.session_interface.get_signing_serializer(app)
+    cookie = parse_cookie(_asgi_headers(scope).get("Cookie", "")).get(app.config["SESSION_COOKIE_NAME"])
+    if serializer is None or not cookie:
+        return None
+    try:
+        session = serializer.loads(cookie, max_age=int(app.permanent_session_lifetime.total_seconds()))
+        user_id = int(session["_user_id"])
+    except Exception:
+        return None
+    try:
+        return await async_single_flight(("session_user", user_id), lambda: supabase_breaker.acall(lambda: fetch_user_async(user_id)))
+    except Exception:
+        return None
+
+
+async def home_page_async(scope, receive):
+    if STATIC_EXPORT_ENABLED:
+        return None
+    try:
+        if bulletins_repo.replica is not None and bulletins_repo.replica_sync.ready:
+            # The replica answers in-process, but SQLite (and a scheduled sync) still
+            # block, so keep them off the event loop
+            bulletins, news = await asyncio.gather(
+                asyncio.to_thread(resilient_read, HOME_BULLETINS_READ, bulletins_repo.active),
+                asyncio.to_thread(resilient_read, HOME_NEWS_READ, news_repo.active),
+            )
+        else:
+            bulletins, news = await asyncio.gather(
+                resilient_read_async(HOME_BULLETINS_READ, lambda: fetch_active_posts_async("bulletin_posts")),
+                resilient_read_async(HOME_NEWS_READ, lambda: fetch_active_posts_async("news_posts")),
+            )
+        status = 200
+    except Exception as e:
+        app.logger.error("Home page data unavailable: %s - %s", type(e).__name__, e)
+        bulletins, news, status = [], [], 503
+    # home.html needs no session, so an anonymous request context renders it identically
+    with app.test_request_context("/"):
+        html = render_template("home.html", bulletins=bulletins, news=news)
+    return status, "text/html; charset=utf-8", html.encode("utf-8")
+
+
+async def google_form_notification_async(scope, receive):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    try:
+        mimetype = _asgi_headers(scope).get("Content-Type", "").split(";")[0].strip()
+        if not (mimetype == "application/json" or (mimetype.startswith("application/") and mimetype.endswith("+json"))):
+            raise ValueError("Content-Type is not application/json")
+        notification_data_to_insert, error = parse_google_form_notification(json.loads(body or b"null"))
+        if error:
+            return _asgi_json(*error)
+
+        try:
+            backend = await get_async_backend()
+            inserted = notifications_repo.record_written(await backend.insert("notifications", notification_data_to_insert))
+            return _asgi_json(*google_form_notification_result(inserted))
+
+        except Exception as db_e:
+            app.logger.error("Webhook: Database exception during insert: %s - %s", type(db_e).__name__, db_e, exc_info=True)
+            return _asgi_json({"error": "Database operation failed"}, 500)
+
+    except Exception as e:
+        app.logger.error("Webhook: General exception: %s - %s", type(e).__name__, e, exc_info=True)
+        return _asgi_json({"error": "An unexpected error occurred on the server"}, 500)
+
+
+def admin_json_read_async(key, fetch, noun, required=True):
+    """Build a login-required JSON view mirroring the patch notes/maintenance APIs."""
+    async def view(scope, receive):
+        if await _asgi_session_user(scope) is None:
+            return None
+        try:
+            data = await resilient_read_async(key, fetch)
+            if data or not required:
+                return _asgi_json(data)
+            app.logger.error("Error fetching all %s: none returned", noun)
+            return _asgi_json({"error": f"Failed to fetch {noun}", "details": ""}, 500)
+        except SupabaseUnavailable as e:
+            return _asgi_json({"error": f"{noun[0].upper()}{noun[1:]} are temporarily unavailable", "details": str(e)}, 503)
+        except Exception as e:
+            app.logger.error("Exception reading %s: %s", noun, e)
+            return _asgi_json({"error": "An unexpected error occurred", "details": str(e)}, 500)
+    return view
+
+
+ASGI_ROUTES = {
+    ("GET", "/"): home_page_async,
+    ("POST", "/api/notifications/google-form"): google_form_notification_async,
+    ("GET", "/api/patch-notes"): admin_json_read_async(ALL_PATCH_NOTES_READ, fetch_all_patch_notes_async, "patch notes"),
+    ("GET", "/api/patch-notes/latest"): admin_json_read_async(LATEST_PATCH_NOTE_READ, fetch_latest_patch_note_async, "patch notes", required=False),
+    ("GET", "/api/system-maintenance"): admin_json_read_async(ALL_SYSTEM_MAINTENANCE_READ, fetch_all_system_maintenance_async, "system maintenance messages"),
+    ("GET", "/api/system-maintenance/latest"): admin_json_read_async(LATEST_SYSTEM_MAINTENANCE_READ, fetch_latest_system_maintenance_async, "system maintenance messages", required=False),
+}
+
+
+ASGI_MISSING_DEPENDENCY = "SERVER_MODE=asgi requires a2wsgi (pip install a2wsgi)"
+
+
+class AsyncApp:
+    def __init__(self, wsgi_app, routes):
+        self.wsgi = WSGIMiddleware(wsgi_app, workers=ASGI_WSGI_THREADS) if WSGIMiddleware is not None else None
+        self.routes = routes
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                if self.wsgi is None:
+                    await send({"type": "lifespan.startup.failed", "message": ASGI_MISSING_DEPENDENCY})
+                    return
+                if self.routes:
+                    await get_async_backend()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await close_async_backend()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.lifespan(receive, send)
+        if self.wsgi is None:
+            raise RuntimeError(ASGI_MISSING_DEPENDENCY)
+        view = self.routes.get((scope.get("method"), scope.get("path"))) if scope["type"] == "http" else None
+        result = await view(scope, receive) if view else None
+        if result is None:
+            return await self.wsgi(scope, receive, send)
+
+        status, content_type, body = result
+        headers = [(b"content-type", content_type.encode("latin-1"))]
+        mimetype = content_type.split(";")[0]
+        if mimetype in COMPRESSION_MIMETYPES:
+            headers.append((b"vary", b"Accept-Encoding"))
+            encoding = _choose_encoding(parse_accept_header(_asgi_headers(scope).get("Accept-Encoding")))
+            if encoding and len(body) >= COMPRESSION_MIN_SIZE:
+                start = time.thread_time()
+                compressed = _compress_body(body, encoding)
+                _record_compression(encoding, len(body), len(compressed), time.thread_time() - start)
+                body = compressed
+                headers.append((b"content-encoding", encoding.encode("latin-1")))
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+asgi_app = AsyncApp(app, ASGI_ROUTES if DATA_BACKEND == "supabase" else {})
+
+mode = os.getenv("SERVER_MODE", "prod") # "prod" (waitress), "asgi" (uvicorn) or "dev"
 
 if __name__ == "__main__":
     if mode == "dev":
         app.run(host="0.0.0.0", debug=True)
     # Use 0.0.0.0 to be reachable in local network, change debug to False in production
+    elif mode == "asgi":
+        if WSGIMiddleware is None:
+            raise SystemExit(ASGI_MISSING_DEPENDENCY)
+        import uvicorn
+        uvicorn.run(asgi_app, host="0.0.0.0", port=5000)
     else:
         serve(app, host="0.0.0.0", port="5000", threads=10)
\ No newline at end of file
@@ -0,0 +1,47 @@
+// Mobile sidebar toggle functionality
+// Note: The DOMContentLoaded listener for sidebar functionality is kept separate
+// from the notification logic for clarity.
+document.addEventListener('DOMContentLoaded', function() {
+  const sidebar = document.getElementById('sidebar');
+  const sidebarToggle = document.getElementById('sidebarToggle');
+  const sidebarBackdrop = document.getElementById('sidebarBackdrop');
+
+  if (sidebarToggle) { // Ensure elements exist before adding listeners
+    sidebarToggle.addEventListener('click', function() {
+      sidebar.classList.toggle('show');
+      sidebarBackdrop.classList.toggle('show');
+    });
+  }
+
+  if (sidebarBackdrop) {
+    sidebarBackdrop.addEventListener('click', function() {
+      sidebar.classList.remove('show');
+      sidebarBackdrop.classList.remove('show');
+    });
+  }
+
+  window.addEventListener('resize', function() {
+    if (window.innerWidth >= 992) {
+      if (sidebar) sidebar.classList.remove('show');
+      if (sidebarBackdrop) sidebarBackdrop.classList.remove('show');
+    }
+  });
+
+  function updateCardCollapses() {
+    const isMobile = window.innerWidth < 768;
+    const collapsibleCards = document.querySelectorAll('[data-bs-toggle="collapse"].d-md-none');
+    collapsibleCards.forEach(toggle => {
+      const targetId = toggle.getAttribute('data-bs-target');
+      const target = document.querySelector(targetId);
+      if (target) {
+        if (isMobile) {
+          target.classList.remove('show');
+        } else {
+          target.classList.add('show');
+        }
+      }
+    });
+  }
+  updateCardCollapses();
+  window.addEventListener('resize', updateCardCollapses);
+});
@@ -0,0 +1,34 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# main.py configures itself from the environment at import time; run it offline
+# against a throwaway SQLite database.
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ["DATA_BACKEND"] = "sqlite"
+os.environ.pop("SUPABASE_URL", None)
+os.environ.pop("SUPABASE_KEY", None)
+# The committed static pages are checked against api/static/pages
+os.environ.pop("STATIC_EXPORT_DIR", None)
+os.environ["REPLICA_PATH"] = os.path.join(tempfile.mkdtemp(prefix="e-looc-tests-"), "replica.sqlite3")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(main.time, "monotonic", clock)
+    return clock
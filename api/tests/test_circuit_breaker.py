@@ -0,0 +1,30 @@
+import main
+
+
+def test_late_failures_do_not_push_back_the_probe(clock):
+    breaker = main.CircuitBreaker(failure_threshold=2, reset_seconds=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    # A slow call that started before the breaker opened fails afterwards
+    clock.now += 20
+    breaker.record_failure()
+    clock.now += 10
+
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert breaker.metrics()["opened"] == 1
+
+
+def test_failed_probe_reopens_the_breaker(clock):
+    breaker = main.CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+
+    breaker.record_failure()
+    clock.now += 29
+
+    assert not breaker.allow()
+    assert breaker.metrics()["opened"] == 2
@@ -0,0 +1,29 @@
+import pytest
+from werkzeug.http import parse_accept_header
+
+import main
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip, br;q=0.1", "gzip"),
+        ("br;q=0.5, gzip;q=0.8", "gzip"),
+        ("br, gzip", "br"),
+        ("gzip, br", "br"),
+        ("gzip;q=0.5, br;q=0.5", "br"),
+        ("br;q=0, gzip;q=0.1", "gzip"),
+        ("*", "br"),
+        ("identity", None),
+        ("gzip;q=0, br;q=0", None),
+    ],
+)
+def test_choose_encoding_prefers_highest_quality(monkeypatch, header, expected):
+    monkeypatch.setattr(main, "brotli", object())
+    assert main._choose_encoding(parse_accept_header(header)) == expected
+
+
+def test_choose_encoding_without_brotli(monkeypatch):
+    monkeypatch.setattr(main, "brotli", None)
+    assert main._choose_encoding(parse_accept_header("br, gzip;q=0.1")) == "gzip"
+    assert main._choose_encoding(parse_accept_header("br")) is None
@@ -0,0 +1,95 @@
+import pytest
+
+import main
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return main.SQLiteBackend(str(tmp_path / "data.sqlite3"))
+
+
+@pytest.fixture
+def replica_sync(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "REPLICA_PULL_BATCH_SIZE", 3)
+    source = main.SQLiteBackend(str(tmp_path / "source.sqlite3"))
+    replica = main.SQLiteBackend(str(tmp_path / "replica.sqlite3"))
+    return main.ReplicaSync(source, replica, ["bulletin_posts"], 30)
+
+
+def post(id, updated_at="2025-01-01T00:00:00+00:00", **fields):
+    return dict({"id": id, "is_active": True, "date_posted": f"2025-01-{id:02d}", "updated_at": updated_at}, **fields)
+
+
+def ids(rows):
+    return [row["id"] for row in rows]
+
+
+def test_select_filters(backend):
+    backend.insert("bulletin_posts", [post(1), post(2, is_active=False), post(3), post(4)])
+    assert ids(backend.select("bulletin_posts", [("eq", "is_active", True)])) == [1, 3, 4]
+    assert ids(backend.select("bulletin_posts", [("gt", "id", 1), ("lte", "date_posted", "2025-01-03")])) == [2, 3]
+    assert ids(backend.select("bulletin_posts", [("in_", "id", [2, 4])])) == [2, 4]
+    assert ids(backend.select("bulletin_posts", [("neq", "id", 1)])) == [2, 3, 4]
+    assert backend.count("bulletin_posts", [("eq", "is_active", True)]) == 3
+
+
+def test_select_order_limit_offset(backend):
+    backend.insert("bulletin_posts", [post(1), post(2), post(3), post(4)])
+    assert ids(backend.select("bulletin_posts", order=[("date_posted", True)], limit=2)) == [4, 3]
+    assert ids(backend.select("bulletin_posts", order=[("date_posted", True)], limit=2, offset=2)) == [2, 1]
+    assert ids(backend.select("bulletin_posts", order=[("is_active", False), ("date_posted", True)])) == [4, 3, 2, 1]
+
+
+def test_select_rejects_unknown_tables(backend):
+    with pytest.raises(ValueError):
+        backend.select("sqlite_master")
+
+
+def test_update_and_delete_return_affected_rows(backend):
+    backend.insert("bulletin_posts", [post(1), post(2)])
+    assert backend.update("bulletin_posts", [("eq", "id", 1)], {"is_active": False})[0]["is_active"] is False
+    assert ids(backend.delete("bulletin_posts", [("eq", "id", 2)])) == [2]
+    assert ids(backend.select("bulletin_posts")) == [1]
+
+
+def test_next_page_walks_tied_updated_at_by_id(replica_sync):
+    replica_sync.source.insert("bulletin_posts", [post(i) for i in range(1, 8)] + [post(8, "2025-01-02T00:00:00+00:00")])
+    pages = []
+    cursor = last_id = None
+    while True:
+        rows = replica_sync._next_page("bulletin_posts", cursor, last_id)
+        pages.append(ids(rows))
+        if len(rows) < main.REPLICA_PULL_BATCH_SIZE:
+            break
+        cursor, last_id = rows[-1]["updated_at"], rows[-1]["id"]
+    assert pages == [[1, 2, 3], [4, 5, 6], [7, 8]]
+
+
+def test_pull_table_is_incremental(replica_sync):
+    source, replica = replica_sync.source, replica_sync.replica
+    source.insert("bulletin_posts", [post(i) for i in range(1, 8)])
+    assert replica_sync.pull_table("bulletin_posts") == (7, 0)
+    assert replica_sync.pull_table("bulletin_posts") == (0, 0)
+    source.update("bulletin_posts", [("eq", "id", 2)], {"title": "edited", "updated_at": "2025-01-03T00:00:00+00:00"})
+    source.insert("bulletin_posts", [post(9)])
+    assert replica_sync.pull_table("bulletin_posts") == (2, 0)
+    assert replica.count("bulletin_posts") == 8
+    assert replica.select("bulletin_posts", [("eq", "id", 2)])[0]["title"] == "edited"
+    assert replica.sync_state("bulletin_posts")[:2] == ("2025-01-03T00:00:00+00:00", 2)
+
+
+def test_retain_ids_removes_rows_deleted_upstream(backend):
+    backend.insert("bulletin_posts", [post(i) for i in range(1, 6)])
+    assert backend.retain_ids("bulletin_posts", [1, 3, 5, 99]) == 2
+    assert ids(backend.select("bulletin_posts")) == [1, 3, 5]
+    assert backend.retain_ids("bulletin_posts", []) == 3
+    assert backend.count("bulletin_posts") == 0
+
+
+def test_archive_repository_pages_newest_first(backend):
+    repo = main.NotificationArchiveRepository(backend)
+    repo.archive([{"id": i, "form_type": "a" if i % 2 else "b", "created_at": f"2025-01-{i:02d}"} for i in range(1, 6)])
+    items, total = repo.page(None, 0, 2)
+    assert (ids(items), total) == ([5, 4], 5)
+    items, total = repo.page("a", 2, 2)
+    assert (ids(items), total) == ([1], 3)
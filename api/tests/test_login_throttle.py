@@ -0,0 +1,87 @@
+from main import LoginThrottle
+
+
+def make_throttle(**overrides):
+    options = dict(rate_per_minute=60, burst=3, lockout_after=3, lockout_base=30, lockout_max=120, max_keys=100)
+    options.update(overrides)
+    return LoginThrottle(**options)
+
+
+def attempt(throttle, ip="1.1.1.1", username="admin"):
+    return throttle.acquire([f"ip:{ip}", f"user:{username}"], f"pair:{ip}|{username}")
+
+
+def test_bucket_refills_over_time(clock):
+    throttle = make_throttle()
+    assert [attempt(throttle) for _ in range(3)] == [0, 0, 0]
+    assert attempt(throttle) == 2  # one token at 1/s, rounded up
+    clock.now += 1
+    assert attempt(throttle) == 0
+    assert attempt(throttle) > 0
+
+
+def test_rejected_attempt_takes_no_token(clock):
+    throttle = make_throttle()
+    for _ in range(3):
+        attempt(throttle)
+    for _ in range(10):
+        assert attempt(throttle) > 0
+    clock.now += 1
+    assert attempt(throttle) == 0
+
+
+def test_lockout_grows_exponentially_and_caps(clock):
+    throttle = make_throttle(burst=100, rate_per_minute=6000)
+    durations = []
+    for _ in range(4):
+        for _ in range(3):
+            assert attempt(throttle) == 0
+            throttle.record_failure("pair:1.1.1.1|admin")
+        durations.append(attempt(throttle))
+        clock.now += durations[-1]
+    assert durations == [31, 61, 121, 121]
+
+
+def test_success_resets_lockout_growth(clock):
+    throttle = make_throttle(burst=100, rate_per_minute=6000)
+    for _ in range(3):
+        throttle.record_failure("pair:1.1.1.1|admin")
+    clock.now += 31
+    throttle.record_success("pair:1.1.1.1|admin")
+    for _ in range(3):
+        throttle.record_failure("pair:1.1.1.1|admin")
+    assert attempt(throttle) == 31
+
+
+def test_lockout_applies_to_ip_and_username_pair_only(clock):
+    throttle = make_throttle(burst=100, rate_per_minute=6000)
+    for _ in range(3):
+        throttle.record_failure("pair:6.6.6.6|admin")
+    assert attempt(throttle, ip="6.6.6.6") > 0
+    assert attempt(throttle, ip="2.2.2.2") == 0
+    assert attempt(throttle, ip="6.6.6.6", username="someone") == 0
+
+
+def test_rejected_attempts_do_not_evict_lockouts(clock):
+    throttle = make_throttle(max_keys=10)
+    for _ in range(3):
+        throttle.record_failure("pair:6.6.6.6|admin")
+    # Exhaust the IP's bucket, then spray junk usernames from it
+    for i in range(3):
+        attempt(throttle, ip="6.6.6.6", username=f"junk{i}")
+    for i in range(200):
+        assert attempt(throttle, ip="6.6.6.6", username=f"spray{i}") > 0
+    assert len(throttle._entries) <= 10
+    assert attempt(throttle, ip="6.6.6.6") > 0
+
+
+def test_eviction_skips_locked_entries(clock):
+    throttle = make_throttle(max_keys=5, burst=100, rate_per_minute=6000)
+    for _ in range(3):
+        throttle.record_failure("pair:6.6.6.6|admin")
+    for i in range(50):
+        assert attempt(throttle, ip=f"10.0.0.{i}", username="other") == 0
+    assert "pair:6.6.6.6|admin" in throttle._entries
+    assert len(throttle._entries) <= 5
+    assert throttle.metrics()["evictions"] > 0
+    assert attempt(throttle, ip="6.6.6.6") > 0
@@ -0,0 +1,39 @@
+import pytest
+
+import main
+
+
+@pytest.fixture
+def notifications(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "NOTIFICATIONS_ARCHIVE_DIR", str(tmp_path))
+    backend = main.notifications_repo.primary
+    backend.delete("notifications", [])
+    backend.insert("notifications", [
+        {"id": i, "form_type": "f", "data": {}, "is_read": True, "created_at": "2020-01-01T00:00:00+00:00"}
+        for i in range(1, 8)
+    ])
+    yield backend
+    backend.delete("notifications", [])
+
+
+def test_compaction_archives_and_deletes_in_batches(notifications):
+    result = main.compact_notifications(older_than_days=1, mode="jsonl", batch_size=3)
+    assert (result["archived"], result["batches"]) == (7, 3)
+    assert notifications.count("notifications") == 0
+    items, total = main.query_archived_notifications(mode="jsonl")
+    assert total == 7
+
+
+def test_compaction_stops_when_delete_removes_nothing(notifications, monkeypatch):
+    monkeypatch.setattr(main.notifications_repo, "delete_many", lambda ids: [])
+    with pytest.raises(RuntimeError, match="deleted 0 of 3"):
+        main.compact_notifications(older_than_days=1, mode="jsonl", batch_size=3)
+
+
+def test_archive_view_deduplicates_reappended_batches(notifications):
+    rows = notifications.select("notifications")
+    now = main.datetime.now(main.pytz.utc)
+    main._append_notifications_jsonl(rows, now)
+    main._append_notifications_jsonl(rows, now)
+    items, total = main.query_archived_notifications(mode="jsonl")
+    assert total == 7
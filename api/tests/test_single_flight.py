@@ -0,0 +1,87 @@
+import threading
+import time
+
+import main
+
+
+class FakeResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    """Records the PostgREST builder calls; execute() blocks until released."""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.calls = [table]
+
+    def __getattr__(self, name):
+        def method(*args, **kwargs):
+            self.calls.append((name, args, tuple(sorted(kwargs.items()))))
+            return self
+        return method
+
+    def execute(self):
+        self.client.executed.append(self.calls)
+        self.client.release.wait(5)
+        return FakeResponse([{"id": 1}], count=1)
+
+
+class FakeClient:
+    def __init__(self):
+        self.executed = []
+        self.release = threading.Event()
+
+    def table(self, table):
+        return FakeQuery(self, table)
+
+
+def run_concurrently(calls):
+    results = [None] * len(calls)
+
+    def run(i, call):
+        results[i] = call()
+
+    threads = [threading.Thread(target=run, args=(i, call)) for i, call in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_identical_selects_share_one_round_trip():
+    client = FakeClient()
+    backend = main.SupabaseBackend(client)
+    query = lambda: backend.select("patch_notes", [("eq", "a", 1), ("gt", "b", 2)], [("date", True)], 5)
+    reordered = lambda: backend.select("patch_notes", [("gt", "b", 2), ("eq", "a", 1)], [("date", True)], 5)
+    threads, results = run_concurrently([query] * 5 + [reordered] * 5)
+    time.sleep(0.2)
+    client.release.set()
+    for thread in threads:
+        thread.join()
+    assert len(client.executed) == 1
+    assert results == [[{"id": 1}]] * 10
+
+
+def test_different_queries_are_not_coalesced():
+    client = FakeClient()
+    client.release.set()
+    backend = main.SupabaseBackend(client)
+    threads, results = run_concurrently([
+        lambda: backend.select("patch_notes", limit=1),
+        lambda: backend.select("patch_notes", limit=1, offset=1),
+        lambda: backend.select("patch_notes", [("in_", "id", [1, 2])]),
+        lambda: backend.count("patch_notes"),
+    ])
+    for thread in threads:
+        thread.join()
+    assert len(client.executed) == 4
+    assert results[3] == 1
+
+
+def test_query_key_matches_the_issued_query():
+    assert main.query_key("t", [("eq", "a", 1), ("in_", "id", [1, 2])]) == main.query_key("t", [("in_", "id", [1, 2]), ("eq", "a", 1)])
+    assert main.query_key("t", order=[("date", True)]) != main.query_key("t", order=[("date", False)])
+    assert main.query_key("t", limit=8) != main.query_key("t", limit=8, offset=8)
+    assert main.query_key("t") != main.query_key("t", count=True)
@@ -0,0 +1,14 @@
+import main
+
+
+def test_committed_static_pages_are_current():
+    # Vercel serves these files as-is; re-run `flask export-static --skip-home` after template changes
+    assert main.stale_static_pages() == []
+
+
+def test_stale_page_is_reported(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "STATIC_EXPORT_DIR", str(tmp_path))
+    main.export_static_page("about.html")
+    (tmp_path / "credits.html").write_text("<html>old</html>", encoding="utf-8")
+
+    assert main.stale_static_pages() == ["credits.html", "coming_soon.html"]